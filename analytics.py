@@ -0,0 +1,152 @@
+"""
+Analytics for Express Wash Laundry Billing System
+The figures behind the Analytics page. Each one is an aggregate query on the
+daily summary rollup or the orders table, so the page receives a few
+kilobytes of results instead of the orders themselves. dashboard() runs them
+in parallel on pooled connections. Kept free of Streamlit so they can be
+benchmarked.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import order_frame
+import rollup
+from pricing import SERVICE_LABELS
+
+DASHBOARD_WORKERS = 4   # queries run at once; keep below the connection pool size
+
+# Order count and revenue come from the rollup, one row per day
+TOTALS_SQL = '''
+    SELECT COALESCE(SUM(order_count), 0), COALESCE(SUM(revenue), 0)
+    FROM daily_summary
+'''
+
+UNIQUE_CUSTOMERS_SQL = '''
+    SELECT COUNT(DISTINCT customer_name) FROM orders
+'''
+
+# Per-service amounts are stored on each order at the rates it was billed at
+SERVICE_REVENUE_SQL = '''
+    SELECT COALESCE(SUM(regular_cost), 0), COALESCE(SUM(blankets_cost), 0),
+           COALESCE(SUM(white_cost), 0)
+    FROM orders
+'''
+
+TOP_CUSTOMERS_SQL = '''
+    SELECT customer_name, SUM(total_amount) AS revenue
+    FROM orders
+    GROUP BY customer_name
+    ORDER BY revenue DESC, customer_name
+    LIMIT %s
+'''
+
+RECENT_ORDERS_SQL = '''
+    SELECT customer_name, total_amount, created_at
+    FROM orders
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+'''
+
+# Worker threads shared by the whole process; each query borrows a pooled connection
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _fetch(conn, query, params=()):
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    columns = [d[0] for d in cursor.description]
+    cursor.close()
+    return rows, columns
+
+
+def order_totals(conn):
+    """Total orders, revenue and average order value"""
+    (total_orders, total_revenue), = _fetch(conn, TOTALS_SQL)[0]
+    total_orders, total_revenue = int(total_orders), float(total_revenue)
+    return {
+        'total_orders': total_orders,
+        'total_revenue': total_revenue,
+        'avg_order_value': total_revenue / total_orders if total_orders else 0.0,
+    }
+
+
+def unique_customers(conn):
+    """Number of distinct customer names"""
+    return int(_fetch(conn, UNIQUE_CUSTOMERS_SQL)[0][0][0])
+
+
+def key_metrics(conn):
+    """Total orders, revenue, average order value and unique customers"""
+    metrics = order_totals(conn)
+    metrics['unique_customers'] = unique_customers(conn)
+    return metrics
+
+
+def service_revenue(conn):
+    """Revenue per service type, as billed"""
+    row = _fetch(conn, SERVICE_REVENUE_SQL)[0][0]
+    return dict(zip(SERVICE_LABELS, (float(value) for value in row)))
+
+
+def top_customers(conn, limit=10):
+    """Customers with the highest total spend, as a Series of revenue by name"""
+    rows, _ = _fetch(conn, TOP_CUSTOMERS_SQL, (limit,))
+    return pd.Series([float(revenue) for _, revenue in rows],
+                     index=pd.Index([name for name, _ in rows], name='customer_name'),
+                     name='total_amount', dtype='float64')
+
+
+def recent_orders(conn, limit=5):
+    """The newest orders (the display formats them)"""
+    rows, columns = _fetch(conn, RECENT_ORDERS_SQL, (limit,))
+    return order_frame.from_rows(rows, columns)
+
+
+# Queries behind the Analytics page, by result name
+DASHBOARD_QUERIES = {
+    'summary': rollup.load_daily_summary,
+    'totals': order_totals,
+    'unique_customers': unique_customers,
+    'service_revenue': service_revenue,
+    'top_customers': top_customers,
+    'recent_orders': recent_orders,
+}
+
+
+def _get_executor(workers):
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analytics')
+            _executors[workers] = executor
+        return executor
+
+
+def _run(db, query):
+    with db.connection() as conn:
+        return query(conn)
+
+
+def dashboard(db, workers=DASHBOARD_WORKERS):
+    """Every Analytics page figure, each query on its own pooled connection.
+
+    Returns the daily summary, key metrics, service revenue, top customers
+    and recent orders. With workers=1 the queries run one after another on
+    the calling thread.
+    """
+    if workers <= 1:
+        results = {name: _run(db, query) for name, query in DASHBOARD_QUERIES.items()}
+    else:
+        executor = _get_executor(workers)
+        futures = {name: executor.submit(_run, db, query) for name, query in DASHBOARD_QUERIES.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    metrics = results.pop('totals')
+    metrics['unique_customers'] = results.pop('unique_customers')
+    results['metrics'] = metrics
+    return results
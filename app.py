@@ -1,10 +1,23 @@
 import streamlit as st
 import pandas as pd
-import mysql.connector
 from datetime import datetime, date
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import storage
+from repository import OrderRepository
+import csv_backup
+import exports
+from data_cache import get_cache
+import order_queries
+import order_frame
+import bootstrap
+import customer_lookup
+import order_import
+import analytics
+import archive
+import pricing
+from pricing import PRICING, calculate_bill
 
 # Page configuration
 st.set_page_config(
@@ -54,206 +67,166 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Database configuration
+# Database configuration: DB_BACKEND is "mysql" (default) or "sqlite"
+DB_BACKEND = st.secrets.get("DB_BACKEND", storage.DEFAULT_BACKEND).lower()
+SQLITE_PATH = st.secrets.get("SQLITE_PATH", storage.DEFAULT_SQLITE_PATH)
 DB_CONFIG = {
     'host': st.secrets["DB_HOST"],
     'user': st.secrets["DB_USER"],
     'password': st.secrets["DB_PASS"],
     'database': st.secrets["DB_NAME"]
+} if DB_BACKEND == 'mysql' else {}
+
+# Connection pool shared by every session of this Streamlit server
+POOL_SIZE = int(st.secrets.get("DB_POOL_SIZE", 5))
+POOL_TIMEOUT = int(st.secrets.get("DB_POOL_TIMEOUT", 10))
+
+def get_db():
+    """Return the process-wide database (MySQL connection pool or SQLite file)"""
+    return storage.get_database(DB_BACKEND, DB_CONFIG, SQLITE_PATH,
+                                pool_size=POOL_SIZE, timeout=POOL_TIMEOUT)
+
+# Order data cache shared across reruns; writes bump its data version
+CACHE_TTL = int(st.secrets.get("CACHE_TTL", 300))
+CACHE_MAX_MB = int(st.secrets.get("CACHE_MAX_MB", 256))
+
+# Receipt numbers: 1 = reserve inside each order's transaction,
+# >1 = reserve blocks of numbers per server process
+RECEIPT_BLOCK_SIZE = int(st.secrets.get("RECEIPT_BLOCK_SIZE", 1))
+
+# Analytics page queries run at once, each on its own pooled connection
+DASHBOARD_WORKERS = int(st.secrets.get("DASHBOARD_WORKERS", analytics.DASHBOARD_WORKERS))
+
+# Closed months are copied to a Parquet archive for historical reports
+ARCHIVE_DIR = st.secrets.get("ARCHIVE_DIR", archive.ARCHIVE_DIR)
+ARCHIVE_INTERVAL = int(st.secrets.get("ARCHIVE_INTERVAL", archive.ARCHIVE_INTERVAL))
+
+# How order columns are labelled and formatted in tables; the frames keep their dtypes
+ORDER_COLUMN_CONFIG = {
+    'id': st.column_config.NumberColumn("ID", format="%d"),
+    'customer_name': st.column_config.TextColumn("Customer Name"),
+    'mobile_number': st.column_config.TextColumn("Mobile Number"),
+    'order_date': st.column_config.DateColumn("Order Date", format="MMMM D, YYYY"),
+    'regular_clothes_kg': st.column_config.NumberColumn("Regular (kg)", format="%.2f"),
+    'blankets_kg': st.column_config.NumberColumn("Blankets (kg)", format="%.2f"),
+    'white_clothes_pieces': st.column_config.NumberColumn("White (pieces)", format="%d"),
+    'total_amount': st.column_config.NumberColumn("Total Amount", format="₹%.2f"),
+    'created_at': st.column_config.DatetimeColumn("Created At", format="MMMM D, YYYY HH:mm"),
 }
 
+def get_orders_cache():
+    """Return the process-wide cache for order query results"""
+    return get_cache('orders', ttl=CACHE_TTL, max_bytes=CACHE_MAX_MB * 1024 * 1024)
+
+def get_repository():
+    """Return the order repository on the configured database"""
+    return OrderRepository(get_db(), RECEIPT_BLOCK_SIZE)
+
 # Initialize database
 def init_database():
-    """Initialize MySQL database and create tables if they don't exist"""
+    """Create the database and apply migrations once per server process"""
     try:
-        # First connect without database to create it if it doesn't exist
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
-        cursor = conn.cursor()
-        
-        # Create database if it doesn't exist
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-        cursor.execute(f"USE {DB_CONFIG['database']}")
-        
-        # Create orders table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS orders (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                customer_name VARCHAR(255) NOT NULL,
-                mobile_number VARCHAR(20),
-                order_date DATE NOT NULL,
-                regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                blankets_kg DECIMAL(5,2) DEFAULT 0,
-                white_clothes_pieces INT DEFAULT 0,
-                total_amount DECIMAL(10,2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
-        st.success("✅ Database initialized successfully!")
-        
-    except mysql.connector.Error as err:
+        bootstrap.ensure_schema(get_db(), create_database=True)
+        return True
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
-        st.info("Please make sure MySQL is running and credentials are correct.")
-
-# Pricing configuration
-PRICING = {
-    'regular_clothes': 50,  # ₹50/kg
-    'blankets': 100,        # ₹100/kg
-    'white_clothes': 40     # ₹40/piece
-}
-
-def calculate_bill(regular_kg, blankets_kg, white_pieces):
-    """Calculate total bill based on services"""
-    regular_cost = regular_kg * PRICING['regular_clothes']
-    blankets_cost = blankets_kg * PRICING['blankets']
-    white_cost = white_pieces * PRICING['white_clothes']
-    
-    total = regular_cost + blankets_cost + white_cost
-    return {
-        'regular_cost': regular_cost,
-        'blankets_cost': blankets_cost,
-        'white_cost': white_cost,
-        'total': total
-    }
+        if DB_BACKEND == 'mysql':
+            st.info("Please make sure MySQL is running and credentials are correct.")
+        else:
+            st.info(f"Please make sure {SQLITE_PATH} is writable.")
+        return False
 
-def save_order_to_csv(order_data):
-    """Save order to CSV file"""
-    csv_file = 'orders.csv'
-    
-    # Check if file exists, if not create with headers
-    if not os.path.exists(csv_file):
-        df = pd.DataFrame([order_data])
-    else:
-        df = pd.read_csv(csv_file)
-        df = pd.concat([df, pd.DataFrame([order_data])], ignore_index=True)
-    
-    df.to_csv(csv_file, index=False)
+def save_order_to_csv(order_id, order_data):
+    """Append a saved order to the CSV backup"""
+    try:
+        csv_backup.append_order(order_id, order_data)
+    except Exception as e:
+        st.error(f"Error updating CSV backup: {str(e)}")
 
-def update_csv_backup():
-    """Update CSV file to match database"""
+def update_csv_backup(order_id, order_data=None):
+    """Journal an edit (or a delete when no data is given) in the CSV backup"""
     try:
-        df = load_orders()
-        if not df.empty:
-            df.to_csv('orders.csv', index=False)
+        if order_data is None:
+            csv_backup.record_delete(order_id)
+        else:
+            csv_backup.record_update(order_id, order_data)
     except Exception as e:
         st.error(f"Error updating CSV backup: {str(e)}")
 
 def save_order_to_db(order_data):
-    """Save order to MySQL database"""
+    """Save order to the database and return its new id.
+    
+    A receipt number is issued (in the same transaction unless this server
+    reserves blocks) and stored in order_data['receipt_number'].
+    """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO orders (customer_name, mobile_number, order_date, regular_clothes_kg, 
-                               blankets_kg, white_clothes_pieces, total_amount)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ''', (
-            order_data['customer_name'],
-            order_data['mobile_number'],
-            order_data['order_date'],
-            order_data['regular_clothes_kg'],
-            order_data['blankets_kg'],
-            order_data['white_clothes_pieces'],
-            order_data['total_amount']
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-    except mysql.connector.Error as err:
+        order_id = get_repository().save_order(order_data)
+        get_orders_cache().bump_version()
+        return order_id
+        
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
         raise
 
+def _query_all_orders():
+    return get_repository().load_orders()
+
 def load_orders():
-    """Load orders from MySQL database"""
+    """Load orders from the database (cached until the data changes).
+    
+    The returned frame is shared between reruns and sessions, so callers
+    must not modify it in place.
+    """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        df = pd.read_sql_query('SELECT * FROM orders ORDER BY created_at DESC', conn)
-        conn.close()
-        return df
-    except mysql.connector.Error as err:
+        return get_orders_cache().get('all_orders', _query_all_orders)
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
         return pd.DataFrame()  # Return empty DataFrame on error
 
 def update_order(order_id, order_data):
-    """Update an existing order in MySQL database"""
+    """Update an existing order in the database"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE orders 
-            SET customer_name = %s, mobile_number = %s, order_date = %s,
-                regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
-                total_amount = %s
-            WHERE id = %s
-        ''', (
-            order_data['customer_name'],
-            order_data['mobile_number'],
-            order_data['order_date'],
-            order_data['regular_clothes_kg'],
-            order_data['blankets_kg'],
-            order_data['white_clothes_pieces'],
-            order_data['total_amount'],
-            order_id
-        ))
-        
-        conn.commit()
-        conn.close()
+        if not get_repository().update_order(order_id, order_data):
+            st.error("❌ Order not found. It may have been deleted.")
+            return False
+        get_orders_cache().bump_version()
         
         # Update CSV backup
-        update_csv_backup()
+        update_csv_backup(order_id, order_data)
         
         return True
-    except mysql.connector.Error as err:
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
         return False
 
 def delete_order(order_id):
-    """Delete an order from MySQL database"""
+    """Delete an order from the database"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
-        
-        conn.commit()
-        conn.close()
+        if not get_repository().delete_order(order_id):
+            st.error("❌ Order not found. It may have been deleted.")
+            return False
+        get_orders_cache().bump_version()
         
         # Update CSV backup
-        update_csv_backup()
+        update_csv_backup(order_id)
         
         return True
-    except mysql.connector.Error as err:
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
         return False
 
 def get_order_by_id(order_id):
     """Get a specific order by ID"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM orders WHERE id = %s', (order_id,))
-        result = cursor.fetchone()
-        
-        conn.close()
-        return result
-    except mysql.connector.Error as err:
+        return get_repository().get_order(order_id)
+    except storage.DatabaseError as err:
         st.error(f"❌ Database error: {err}")
         return None
 
 def main():
-    # Initialize database
-    init_database()
+    # Initialize database and start archiving closed months in the background
+    if init_database():
+        archive.start_archiver(get_db(), ARCHIVE_DIR, ARCHIVE_INTERVAL)
     
     # Main header
     st.markdown('<h1 class="main-header">🧺 Express Wash</h1>', unsafe_allow_html=True)
@@ -263,13 +236,33 @@ def main():
     st.sidebar.title("📋 Navigation")
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["🏠 New Order", "📊 Order History", "📈 Analytics", "💰 Pricing"]
+        ["🏠 New Order", "📊 Order History", "📥 Import Orders", "📈 Analytics", "💰 Pricing"]
     )
     
+    # Connection pool statistics
+    with st.sidebar.expander("🔌 Connection Pool"):
+        stats = get_db().stats()
+        st.write(f"**Database:** {storage.describe(get_db())}")
+        st.write(f"**Pool size:** {stats['pool_size']} ({stats['in_use']} in use, {stats['idle']} idle)")
+        st.write(f"**Checkouts:** {stats['checkouts']}")
+        st.write(f"**Waits:** {stats['waits']} (avg {stats['avg_wait_ms']:.1f} ms, max {stats['max_wait_ms']:.1f} ms)")
+        st.write(f"**Timeouts:** {stats['timeouts']}")
+        st.write(f"**Connects / Reconnects:** {stats['connects']} / {stats['reconnects']}")
+    
+    # Data cache statistics
+    with st.sidebar.expander("🗃️ Data Cache"):
+        stats = get_orders_cache().stats()
+        st.write(f"**Data version:** {stats['version']}")
+        st.write(f"**Hits / Misses:** {stats['hits']} / {stats['misses']} ({stats['hit_rate']:.0%} hit rate)")
+        st.write(f"**Entries:** {stats['entries']} ({stats['bytes'] / 1024 / 1024:.1f} MB of {CACHE_MAX_MB} MB)")
+        st.write(f"**Expired / Evicted:** {stats['expired']} / {stats['evictions']}")
+    
     if page == "🏠 New Order":
         new_order_page()
     elif page == "📊 Order History":
         order_history_page()
+    elif page == "📥 Import Orders":
+        import_page()
     elif page == "📈 Analytics":
         analytics_page()
     elif page == "💰 Pricing":
@@ -279,6 +272,10 @@ def new_order_page():
     """Page for creating new orders"""
     st.markdown('<h2 class="sub-header">📝 New Order</h2>', unsafe_allow_html=True)
     
+    last_receipt = st.session_state.pop('last_receipt', None)
+    if last_receipt:
+        st.success(f"✅ Order saved successfully! Receipt Number: **{last_receipt}**")
+    
     # Customer Information
     st.subheader("👤 Customer Information")
     col1, col2 = st.columns(2)
@@ -350,17 +347,21 @@ def new_order_page():
                     'total_amount': bill['total']
                 }
                 
-                # Save to both CSV and database
-                save_order_to_csv(order_data)
-                save_order_to_db(order_data)
+                # Save to database, then append to the CSV backup
+                order_id = save_order_to_db(order_data)
+                save_order_to_csv(order_id, order_data)
                 
                 st.markdown('<div class="success-message">', unsafe_allow_html=True)
                 st.success("✅ Order saved successfully!")
+                st.write(f"**Receipt Number:** {order_data['receipt_number']}")
                 st.write(f"**Customer:** {customer_name}")
                 st.write(f"**Total Amount:** ₹{bill['total']:.2f}")
                 st.write(f"**Order Date:** {order_date.strftime('%B %d, %Y')}")
                 st.markdown("</div>", unsafe_allow_html=True)
                 
+                # Keep the receipt number visible after the form is cleared
+                st.session_state['last_receipt'] = order_data['receipt_number']
+                
                 # Clear form
                 st.rerun()
             else:
@@ -371,11 +372,10 @@ def order_history_page():
     st.markdown('<h2 class="sub-header">📊 Order History & Management</h2>', unsafe_allow_html=True)
     
     try:
-        df = load_orders()
-        
-        if df.empty:
-            st.info("📝 No orders found. Create your first order!")
-            return
+        with get_db().connection() as conn:
+            if not order_queries.has_orders(conn):
+                st.info("📝 No orders found. Create your first order!")
+                return
         
         # CRUD Operations Section
         st.subheader("🛠️ Manage Orders")
@@ -387,23 +387,69 @@ def order_history_page():
         )
         
         if operation == "📋 View Orders":
-            view_orders_section(df)
+            view_orders_section()
         elif operation == "✏️ Edit Order":
-            edit_order_section(df)
+            edit_order_section()
         elif operation == "🗑️ Delete Order":
-            delete_order_section(df)
+            delete_order_section()
         elif operation == "➕ Add New Order":
             add_new_order_section()
         
     except Exception as e:
         st.error(f"Error loading orders: {str(e)}")
 
-def view_orders_section(df):
+def query_orders_page(filters, page_size, after):
+    """Fetch one page of filtered orders plus the total match count (cached per data version)"""
+    def load():
+        with get_db().connection() as conn:
+            total = order_queries.count_orders(conn, filters)
+            page_df, next_cursor = order_queries.fetch_orders_page(conn, filters, page_size, after)
+        return total, page_df, next_cursor
+    
+    key = ('orders_page', filters[0], tuple(filters[1]), page_size, after)
+    return get_orders_cache().get(key, load)
+
+def get_customer_index():
+    """Fuzzy customer index (cached until the data changes)"""
+    def load():
+        with get_db().connection() as conn:
+            return customer_lookup.load_customers(conn)
+    
+    return get_orders_cache().get('customer_index', load)
+
+def _use_customer_suggestion(name):
+    st.session_state["view_search"] = name
+
+def customer_suggestions(search_name):
+    """Offer close customer names when the search has typos or odd spacing"""
+    if len(search_name.strip()) < 3:
+        return
+    try:
+        matches = get_customer_index().search(search_name, limit=5)
+    except storage.DatabaseError:
+        return
+    
+    # Nothing to suggest when the search already names a customer exactly
+    typed = customer_lookup.normalize_name(search_name)
+    if not matches or customer_lookup.normalize_name(matches[0][0]['customer_name']) == typed:
+        return
+    
+    st.caption("🔎 Did you mean:")
+    cols = st.columns(len(matches))
+    for i, (customer, score) in enumerate(matches):
+        with cols[i]:
+            label = customer['customer_name']
+            if customer['mobile_number']:
+                label += f" ({customer['mobile_number']})"
+            st.button(label, key=f"view_suggestion_{i}", help=f"{customer['order_count']} orders",
+                      on_click=_use_customer_suggestion, args=(customer['customer_name'],))
+
+def view_orders_section():
     """Section for viewing orders with filters"""
     st.subheader("📋 View Orders")
     
     # Filters
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         search_name = st.text_input("Search by customer name", placeholder="Enter name...", key="view_search")
@@ -414,87 +460,156 @@ def view_orders_section(df):
     with col3:
         min_amount = st.number_input("Minimum amount", min_value=0.0, value=0.0, key="view_amount")
     
-    # Apply filters
-    filtered_df = df.copy()
-    if search_name:
-        filtered_df = filtered_df[filtered_df['customer_name'].str.contains(search_name, case=False, na=False)]
+    with col4:
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1, key="view_page_size")
+    
+    customer_suggestions(search_name)
+    
+    # Filters are applied in SQL
+    filters = order_queries.build_filters(search_name, date_filter, min_amount)
     
-    if date_filter:
-        filtered_df = filtered_df[filtered_df['order_date'] == date_filter.strftime('%Y-%m-%d')]
+    # Keyset pagination: keep the cursor of every page visited so far and
+    # start again from the first page whenever the filters change
+    signature = (filters[0], tuple(filters[1]), page_size)
+    if st.session_state.get("view_signature") != signature:
+        st.session_state["view_signature"] = signature
+        st.session_state["view_cursors"] = [None]
+    cursors = st.session_state["view_cursors"]
     
-    if min_amount > 0:
-        filtered_df = filtered_df[filtered_df['total_amount'] >= min_amount]
+    total, page_df, next_cursor = query_orders_page(filters, page_size, cursors[-1])
+    page_number = len(cursors)
+    page_count = max(1, -(-total // page_size))
     
     # Display orders
-    st.write(f"**📋 Orders ({len(filtered_df)} found)**")
-    
-    # Format the dataframe for display
-    display_df = filtered_df.copy()
-    display_df['order_date'] = pd.to_datetime(display_df['order_date']).dt.strftime('%B %d, %Y')
-    display_df['total_amount'] = display_df['total_amount'].apply(lambda x: f"₹{x:.2f}")
-    display_df['created_at'] = pd.to_datetime(display_df['created_at']).dt.strftime('%B %d, %Y %H:%M')
-    
-    # Rename columns for better display
-    display_df = display_df.rename(columns={
-        'id': 'ID',
-        'customer_name': 'Customer Name',
-        'mobile_number': 'Mobile Number',
-        'order_date': 'Order Date',
-        'regular_clothes_kg': 'Regular (kg)',
-        'blankets_kg': 'Blankets (kg)',
-        'white_clothes_pieces': 'White (pieces)',
-        'total_amount': 'Total Amount',
-        'created_at': 'Created At'
-    })
-    
-    # Select columns to display
-    columns_to_show = ['ID', 'Customer Name', 'Mobile Number', 'Order Date', 'Regular (kg)', 
-                      'Blankets (kg)', 'White (pieces)', 'Total Amount', 'Created At']
-    
-    st.dataframe(display_df[columns_to_show], use_container_width=True)
+    st.write(f"**📋 Orders ({total} found)** — page {page_number} of {page_count}")
+    
+    # Labels and formats are applied by the table itself, so the cached page is shown as is
+    st.dataframe(page_df, column_config=ORDER_COLUMN_CONFIG, column_order=order_queries.ORDER_COLUMNS,
+                 use_container_width=True)
+    
+    # Page navigation
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("◀ Previous", disabled=page_number == 1, key="view_prev"):
+            cursors.pop()
+            st.rerun()
+    
+    with col2:
+        if st.button("Next ▶", disabled=next_cursor is None, key="view_next"):
+            cursors.append(next_cursor)
+            st.rerun()
     
     # Download options
     st.subheader("📥 Download Data")
+    
+    # Downloads contain every matching order, so each file is only built on request
+    st.caption(f"Exports include all {total} matching orders.")
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        csv_data = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📄 Download as CSV",
-            data=csv_data,
-            file_name=f"express_wash_orders_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
+        # Streamed from the database into a temporary file, chunk by chunk
+        compress = st.checkbox("Compress CSV (gzip)", key="view_compress_csv")
+        export_download(
+            'csv_gz' if compress else 'csv', "CSV", filters,
+            lambda conn: exports.export_orders_csv(conn, filters, compress=compress),
+            "csv.gz" if compress else "csv",
+            "application/gzip" if compress else "text/csv"
         )
     
     with col2:
-        excel_data = filtered_df.to_excel(index=False)
-        st.download_button(
-            label="📊 Download as Excel",
-            data=excel_data,
-            file_name=f"express_wash_orders_{datetime.now().strftime('%Y%m%d')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        # Orders, daily summary and customer totals, written as a streaming workbook
+        export_download(
+            'xlsx', "Excel", filters,
+            lambda conn: exports.export_orders_xlsx(conn, filters),
+            "xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+def export_download(kind, label, filters, build, extension, mime):
+    """Build an export file when its button is clicked, then offer it until the filters or data change"""
+    state_key = f"view_export_{kind}"
+    signature = (filters[0], tuple(filters[1]), get_orders_cache().version)
+    prepared = st.session_state.get(state_key)
+    if prepared is not None and (prepared['signature'] != signature or not os.path.exists(prepared['path'])):
+        if os.path.exists(prepared['path']):
+            os.remove(prepared['path'])
+        del st.session_state[state_key]
+        prepared = None
+    
+    if prepared is None:
+        if not st.button(f"⚙️ Prepare {label} export", key=f"view_prepare_{kind}"):
+            return
+        with st.spinner(f"Writing {label} export..."):
+            with get_db().connection() as conn:
+                path, _ = build(conn)
+        prepared = {
+            'signature': signature,
+            'path': path,
+            'file_name': f"express_wash_orders_{datetime.now().strftime('%Y%m%d')}.{extension}",
+        }
+        st.session_state[state_key] = prepared
+    
+    with open(prepared['path'], 'rb') as f:
+        downloaded = st.download_button(
+            label=f"{'📊' if kind == 'xlsx' else '📄'} Download as {label}",
+            data=f,
+            file_name=prepared['file_name'],
+            mime=mime,
+            key=f"view_download_{kind}"
         )
+    
+    # The file has been sent; stop re-reading it on every rerun
+    if downloaded:
+        os.remove(prepared['path'])
+        del st.session_state[state_key]
 
-def edit_order_section(df):
+def order_labels(df):
+    """'RW-20240115-0001 - ID: 7 - Name - ₹245.00 - 2024-01-15' for each order, built column-wise"""
+    return list(df['receipt_number'].fillna("No receipt").astype(str)
+                + " - ID: " + df['id'].astype(str) + " - " + df['customer_name'].astype(str)
+                + " - " + order_frame.format_rupees(df['total_amount'])
+                + " - " + df['order_date'].dt.strftime('%Y-%m-%d'))
+
+def search_order_matches(term):
+    """Orders matching a picker search (cached per data version)"""
+    def load():
+        # Names are looked up in the fuzzy customer index, taken before the order query's connection
+        customer_index = get_customer_index()
+        with get_db().connection() as conn:
+            return order_queries.search_orders(conn, term, customer_index=customer_index)
+    
+    return get_orders_cache().get(('order_search', ' '.join(term.split()).lower()), load)
+
+def order_picker(key):
+    """Search box plus a short list of matching orders; returns the chosen order id or None"""
+    term = st.text_input("Find order", placeholder="Receipt number, order ID, customer name or phone...",
+                         key=f"{key}_search")
+    try:
+        matches = search_order_matches(term)
+    except storage.DatabaseError as err:
+        st.error(f"❌ Database error: {err}")
+        return None
+    
+    if matches.empty:
+        st.warning("No matching orders found.")
+        return None
+    
+    # Options are order ids, so a new search never keeps a stale selection
+    labels = dict(zip(matches['id'].tolist(), order_labels(matches)))
+    hint = "newest first" if not term.strip() else f"top {len(matches)} matches"
+    return st.selectbox(f"Select order ({hint}):", list(labels), format_func=labels.get,
+                        key=f"{key}_select")
+
+def edit_order_section():
     """Section for editing orders"""
     st.subheader("✏️ Edit Order")
     
     # Select order to edit
-    if df.empty:
-        st.warning("No orders available to edit.")
-        return
-    
-    # Create a selection list
-    order_options = []
-    for _, row in df.iterrows():
-        order_options.append(f"ID: {row['id']} - {row['customer_name']} - ₹{row['total_amount']:.2f} - {row['order_date']}")
-    
-    selected_order = st.selectbox("Select order to edit:", order_options, key="edit_select")
+    order_id = order_picker("edit")
     
-    if selected_order:
-        # Extract order ID from selection
-        order_id = int(selected_order.split(" - ")[0].replace("ID: ", ""))
-        
+    if order_id is not None:
         # Get order details
         order_data = get_order_by_id(order_id)
         
@@ -568,25 +683,13 @@ def edit_order_section(df):
                 else:
                     st.error("❌ Please fill in customer name and order date!")
 
-def delete_order_section(df):
+def delete_order_section():
     """Section for deleting orders"""
     st.subheader("🗑️ Delete Order")
     
-    if df.empty:
-        st.warning("No orders available to delete.")
-        return
-    
-    # Create a selection list
-    order_options = []
-    for _, row in df.iterrows():
-        order_options.append(f"ID: {row['id']} - {row['customer_name']} - ₹{row['total_amount']:.2f} - {row['order_date']}")
-    
-    selected_order = st.selectbox("Select order to delete:", order_options, key="delete_select")
+    order_id = order_picker("delete")
     
-    if selected_order:
-        # Extract order ID from selection
-        order_id = int(selected_order.split(" - ")[0].replace("ID: ", ""))
-        
+    if order_id is not None:
         # Get order details for confirmation
         order_data = get_order_by_id(order_id)
         
@@ -662,60 +765,116 @@ def add_new_order_section():
                     'total_amount': bill['total']
                 }
                 
-                # Save to both CSV and database
-                save_order_to_csv(order_data)
-                save_order_to_db(order_data)
+                # Save to database, then append to the CSV backup
+                order_id = save_order_to_db(order_data)
+                save_order_to_csv(order_id, order_data)
                 
-                st.success("✅ New order saved successfully!")
+                st.success(f"✅ New order saved successfully! Receipt Number: {order_data['receipt_number']}")
                 st.rerun()
             else:
                 st.error("❌ Please fill in customer name and order date!")
 
+def import_page():
+    """Page for bulk importing orders from spreadsheets"""
+    st.markdown('<h2 class="sub-header">📥 Import Orders</h2>', unsafe_allow_html=True)
+    
+    st.info("Upload a CSV or Excel file with at least **customer name** and **order date** columns. "
+            "Totals are recomputed with the current prices and every order gets a new receipt number.")
+    
+    uploaded = st.file_uploader("Order file", type=["csv", "xlsx"], key="import_file")
+    col1, col2 = st.columns(2)
+    with col1:
+        chunk_size = st.number_input("Rows per batch", min_value=100, max_value=50000,
+                                     value=order_import.DEFAULT_CHUNK_SIZE, step=500, key="import_chunk")
+    with col2:
+        dayfirst = st.checkbox("Dates are day first (30/07/2025)", value=order_import.DEFAULT_DAYFIRST,
+                               key="import_dayfirst")
+    
+    if uploaded is None or not st.button("🚀 Start Import", type="primary"):
+        return
+    
+    progress = st.empty()
+    def report(summary):
+        progress.info(f"⏳ {summary['rows_read']:,} rows read, {summary['imported']:,} imported "
+                      f"({summary['rows_per_second']:,.0f} rows/s)")
+    
+    try:
+        with get_db().connection() as conn:
+            summary = order_import.import_orders(conn, uploaded, int(chunk_size),
+                                                 dayfirst=dayfirst, progress=report)
+    except ValueError as e:
+        progress.error(f"❌ {e}")
+        return
+    except storage.DatabaseError as err:
+        progress.error(f"❌ Database error: {err}")
+        return
+    finally:
+        # Chunks committed before a failure are already in the database
+        get_orders_cache().bump_version()
+    
+    progress.success(f"✅ Imported {summary['imported']:,} of {summary['rows_read']:,} rows in "
+                     f"{summary['seconds']:.1f}s ({summary['rows_per_second']:,.0f} rows/s)")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Imported", f"{summary['imported']:,}")
+    col2.metric("Rejected", f"{len(summary['rejected']):,}")
+    col3.metric("Totals recomputed", f"{summary['repriced']:,}")
+    
+    if summary['rejected']:
+        rejected_df = pd.DataFrame(summary['rejected'])
+        rejected_df = rejected_df[['row', 'reason'] + [c for c in rejected_df.columns if c not in ('row', 'reason')]]
+        st.warning(f"⚠️ {len(rejected_df):,} rows were rejected")
+        st.dataframe(rejected_df.head(500), use_container_width=True)
+        st.download_button(
+            label="📥 Download rejected rows",
+            data=rejected_df.to_csv(index=False),
+            file_name="rejected_orders.csv",
+            mime="text/csv"
+        )
+
+def load_dashboard():
+    """Every Analytics page figure, queried in parallel (cached until the data changes)"""
+    return get_orders_cache().get('analytics_dashboard',
+                                  lambda: analytics.dashboard(get_db(), DASHBOARD_WORKERS))
+
 def analytics_page():
     """Page for analytics and insights"""
     st.markdown('<h2 class="sub-header">📈 Analytics & Insights</h2>', unsafe_allow_html=True)
     
     try:
-        df = load_orders()
+        # Aggregate queries only; daily totals come from the rollup table
+        dashboard = load_dashboard()
+        summary = dashboard['summary']
         
-        if df.empty:
+        if summary.empty:
             st.info("📝 No data available for analytics. Create some orders first!")
             return
         
-        # Convert date columns
-        df['order_date'] = pd.to_datetime(df['order_date'])
-        df['created_at'] = pd.to_datetime(df['created_at'])
-        
         # Key metrics
         st.subheader("📊 Key Metrics")
+        metrics = dashboard['metrics']
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_orders = len(df)
-            st.metric("Total Orders", total_orders)
+            st.metric("Total Orders", metrics['total_orders'])
         
         with col2:
-            total_revenue = df['total_amount'].sum()
-            st.metric("Total Revenue", f"₹{total_revenue:,.2f}")
+            st.metric("Total Revenue", f"₹{metrics['total_revenue']:,.2f}")
         
         with col3:
-            avg_order_value = df['total_amount'].mean()
-            st.metric("Average Order Value", f"₹{avg_order_value:.2f}")
+            st.metric("Average Order Value", f"₹{metrics['avg_order_value']:.2f}")
         
         with col4:
-            unique_customers = df['customer_name'].nunique()
-            st.metric("Unique Customers", unique_customers)
+            st.metric("Unique Customers", metrics['unique_customers'])
         
         # Charts
         st.subheader("📈 Revenue Trends")
         
         # Daily revenue
-        daily_revenue = df.groupby('order_date')['total_amount'].sum().reset_index()
-        
-        fig_daily = px.line(daily_revenue, x='order_date', y='total_amount',
+        fig_daily = px.line(summary, x='summary_date', y='revenue',
                            title='Daily Revenue Trend',
-                           labels={'order_date': 'Date', 'total_amount': 'Revenue (₹)'})
+                           labels={'summary_date': 'Date', 'revenue': 'Revenue (₹)'})
         fig_daily.update_layout(height=400)
         st.plotly_chart(fig_daily, use_container_width=True)
         
@@ -726,11 +885,7 @@ def analytics_page():
         
         with col1:
             # Service type breakdown
-            service_data = {
-                'Regular Clothes': df['regular_clothes_kg'].sum() * PRICING['regular_clothes'],
-                'Blankets/Bedsheets': df['blankets_kg'].sum() * PRICING['blankets'],
-                'White Clothes': df['white_clothes_pieces'].sum() * PRICING['white_clothes']
-            }
+            service_data = dashboard['service_revenue']
             
             fig_pie = px.pie(values=list(service_data.values()), 
                            names=list(service_data.keys()),
@@ -739,7 +894,7 @@ def analytics_page():
         
         with col2:
             # Top customers
-            top_customers = df.groupby('customer_name')['total_amount'].sum().sort_values(ascending=False).head(10)
+            top_customers = dashboard['top_customers']
             
             fig_bar = px.bar(x=top_customers.values, y=top_customers.index,
                            orientation='h',
@@ -750,15 +905,56 @@ def analytics_page():
         
         # Recent activity
         st.subheader("🕒 Recent Activity")
-        recent_orders = df.head(5)[['customer_name', 'total_amount', 'created_at']]
-        recent_orders['created_at'] = recent_orders['created_at'].dt.strftime('%B %d, %Y %H:%M')
-        recent_orders['total_amount'] = recent_orders['total_amount'].apply(lambda x: f"₹{x:.2f}")
+        recent_orders = dashboard['recent_orders']
         
-        st.dataframe(recent_orders, use_container_width=True)
+        st.dataframe(recent_orders, column_config=ORDER_COLUMN_CONFIG, use_container_width=True)
+        
+        historical_reports_section()
     
     except Exception as e:
         st.error(f"Error loading analytics: {str(e)}")
 
+def load_monthly_history(start_month, end_month):
+    """Monthly totals from the order archive (cached until the archive changes)"""
+    manifest = archive.load_manifest(ARCHIVE_DIR)
+    stamp = max((month['archived_at'] for month in manifest['months'].values()), default='')
+    key = f"archive_history:{start_month}:{end_month}:{len(manifest['months'])}:{stamp}"
+    return get_orders_cache().get(key, lambda: archive.monthly_history(start_month, end_month, ARCHIVE_DIR))
+
+def historical_reports_section():
+    """Monthly reports read from the Parquet archive instead of the live orders table"""
+    st.subheader("📚 Historical Reports")
+    
+    try:
+        months = archive.archived_months(ARCHIVE_DIR)
+    except (OSError, ValueError) as e:
+        st.error(f"Error reading order archive: {str(e)}")
+        return
+    if not months:
+        st.info("No closed months archived yet. Run `python archive.py` or wait for the background archiver.")
+        return
+    
+    start_month, end_month = st.select_slider("Months", options=months, value=(months[0], months[-1]),
+                                              key="history_months")
+    history = load_monthly_history(start_month, end_month)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Orders", f"{int(history['orders'].sum()):,}")
+    with col2:
+        st.metric("Revenue", f"₹{history['revenue'].sum():,.2f}")
+    with col3:
+        st.metric("Months", len(history))
+    
+    # Only the per-service columns; history already has a 'revenue' total
+    services = history[['month'] + pricing.COST_COLUMNS].melt(id_vars='month', var_name='service',
+                                                              value_name='revenue')
+    services['service'] = services['service'].map(dict(zip(pricing.COST_COLUMNS, pricing.SERVICE_LABELS)))
+    fig_history = px.bar(services, x='month', y='revenue', color='service',
+                         title='Monthly Revenue by Service',
+                         labels={'month': 'Month', 'revenue': 'Revenue (₹)', 'service': 'Service'})
+    st.plotly_chart(fig_history, use_container_width=True)
+
 def pricing_page():
     """Page for pricing information"""
     st.markdown('<h2 class="sub-header">💰 Pricing Information</h2>', unsafe_allow_html=True)
@@ -776,7 +972,8 @@ def pricing_page():
             'Blankets / Bedsheets / Rugs / Duvets (per kg)',
             'White Clothes (per piece)'
         ],
-        'Rate': ['₹50/kg', '₹100/kg', '₹40/piece'],
+        'Rate': [f"₹{PRICING['regular_clothes']}/kg", f"₹{PRICING['blankets']}/kg",
+                 f"₹{PRICING['white_clothes']}/piece"],
         'Description': [
             'Daily wear clothes, shirts, pants, etc.',
             'Heavy items requiring special care',
@@ -787,6 +984,8 @@ def pricing_page():
     pricing_df = pd.DataFrame(pricing_data)
     st.dataframe(pricing_df, use_container_width=True)
     
+    price_simulator_section()
+    
     # Additional information
     st.markdown("""
     ### 📋 Additional Information
@@ -816,5 +1015,70 @@ def pricing_page():
     🕒 Hours: Monday - Sunday, 8:00 AM - 8:00 PM
     """)
 
+def price_simulator_section():
+    """What-if simulator: re-price the order history at new rates"""
+    st.markdown("### 🧮 What-If Price Simulator")
+    st.write("See what past orders would have earned at different rates.")
+    
+    df = load_orders()
+    if df.empty:
+        st.info("No orders yet to simulate against.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        regular_rate = st.number_input("Regular Clothes (₹/kg)", min_value=0.0, step=5.0,
+                                       value=float(PRICING['regular_clothes']))
+    with col2:
+        blankets_rate = st.number_input("Blankets (₹/kg)", min_value=0.0, step=5.0,
+                                        value=float(PRICING['blankets']))
+    with col3:
+        white_rate = st.number_input("White Clothes (₹/piece)", min_value=0.0, step=5.0,
+                                     value=float(PRICING['white_clothes']))
+    
+    order_dates = pd.to_datetime(df['order_date'])
+    first_date, last_date = order_dates.min().date(), order_dates.max().date()
+    period = st.date_input("Order dates", value=(first_date, last_date),
+                           min_value=first_date, max_value=last_date)
+    if len(period) != 2:
+        return
+    in_period = df[(order_dates >= pd.Timestamp(period[0])) & (order_dates <= pd.Timestamp(period[1]))]
+    if in_period.empty:
+        st.info("No orders in the selected period.")
+        return
+    
+    result = pricing.simulate(in_period, {'regular_clothes': regular_rate, 'blankets': blankets_rate,
+                                          'white_clothes': white_rate})
+    change = result['new'] - result['current']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Orders", f"{result['orders']:,}")
+    with col2:
+        st.metric("Revenue at Current Rates", f"₹{result['current']:,.2f}")
+    with col3:
+        st.metric("Revenue at New Rates", f"₹{result['new']:,.2f}",
+                  f"{change:+,.2f} ({change / result['current']:+.1%})" if result['current'] else None)
+    
+    services = result['services'].rename(columns={
+        'service': 'Service', 'current': 'Current (₹)', 'new': 'New (₹)', 'change': 'Change (₹)'})
+    st.dataframe(services.round(2), use_container_width=True)
+    
+    monthly = result['monthly'].melt(id_vars='month', var_name='rates', value_name='revenue')
+    fig_monthly = px.bar(monthly, x='month', y='revenue', color='rates', barmode='group',
+                         title="Monthly Revenue: Current vs New Rates",
+                         labels={'month': 'Month', 'revenue': 'Revenue (₹)', 'rates': 'Rates'})
+    st.plotly_chart(fig_monthly, use_container_width=True)
+    
+    # Size of the cached orders frame the simulator works on, measured when it was loaded
+    with st.expander("🧠 Orders Data in Memory"):
+        footprint = df.attrs['memory_footprint']
+        st.write(f"**{len(df):,} orders** in {footprint['total'] / 1024 / 1024:.1f} MB")
+        st.dataframe(pd.DataFrame({
+            'Column': list(footprint['columns']),
+            'Type': [str(df[column].dtype) for column in footprint['columns']],
+            'KB': [round(size / 1024, 1) for size in footprint['columns'].values()],
+        }), use_container_width=True)
+
 if __name__ == "__main__":
     main() 
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Order Archive for Express Wash Laundry Billing System
+Copies closed months of orders into a compressed Parquet archive with one file
+per month, so historical reports read only the months and columns they need
+instead of the live orders table. A month is rewritten when a checksum of its
+orders changes (an order in it was added, edited or deleted).
+
+Usage: python archive.py [--dir DIR] [--force]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import storage
+
+ARCHIVE_DIR = 'order_archive'
+ARCHIVE_INTERVAL = 3600      # seconds between background archive runs
+FETCH_SIZE = 20000           # rows per Parquet row group
+COMPRESSION = 'zstd'
+MANIFEST = 'manifest.json'
+
+SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('receipt_number', pa.string()),
+    ('customer_name', pa.string()),
+    ('mobile_number', pa.string()),
+    ('order_date', pa.date32()),
+    ('regular_clothes_kg', pa.float64()),
+    ('blankets_kg', pa.float64()),
+    ('white_clothes_pieces', pa.int32()),
+    ('total_amount', pa.float64()),
+    ('regular_cost', pa.float64()),
+    ('blankets_cost', pa.float64()),
+    ('white_cost', pa.float64()),
+    ('pricing_version', pa.int32()),
+    ('created_at', pa.timestamp('s')),
+])
+
+_FLOAT_COLUMNS = {field.name for field in SCHEMA if pa.types.is_floating(field.type)}
+
+# Manifest updates from the background thread and the page must not interleave
+_lock = threading.Lock()
+_archivers = {}
+
+
+def _month_key(day):
+    return f"{day.year}-{day.month:02d}"
+
+
+def _month_bounds(month):
+    """First day of the month and first day of the next one"""
+    year, number = (int(part) for part in month.split('-'))
+    start = date(year, number, 1)
+    end = date(year + number // 12, number % 12 + 1, 1)
+    return start, end
+
+
+def _partition_path(archive_dir, month):
+    return os.path.join(archive_dir, f"month={month}", 'orders.parquet')
+
+
+def load_manifest(archive_dir=ARCHIVE_DIR):
+    """Archived months with their row counts and fingerprints"""
+    path = os.path.join(archive_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {'months': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(archive_dir, manifest):
+    path = os.path.join(archive_dir, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def month_fingerprints(conn, before=None):
+    """Row count and a checksum of every archived column, per month of orders.
+
+    Adding, editing (names and phone numbers included) or deleting an order
+    changes its month's fingerprint. Only months before ``before`` are read.
+    """
+    query = f"SELECT {', '.join(SCHEMA.names)} FROM orders"
+    params = ()
+    if before is not None:
+        query += " WHERE order_date < %s"
+        params = (before,)
+
+    counts, checksums = {}, {}
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            chunk = pd.DataFrame.from_records(rows, columns=SCHEMA.names)
+            months = chunk['order_date'].astype(str).str[:7].to_numpy()
+            # One 64-bit hash per row, added up per month (wrapping, so order does not matter)
+            grouped = pd.util.hash_pandas_object(chunk, index=False).groupby(months)
+            for month, count in grouped.size().items():
+                counts[month] = counts.get(month, 0) + int(count)
+            for month, checksum in grouped.sum().items():
+                checksums[month] = (checksums.get(month, 0) + int(checksum)) % 2 ** 64
+    finally:
+        cursor.close()
+    return {month: f"{counts[month]}:{checksums[month]:016x}" for month in counts}
+
+
+def _record_batch(rows):
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(SCHEMA, columns):
+        if field.name in _FLOAT_COLUMNS:
+            values = [None if v is None else float(v) for v in values]
+        elif field.name == 'order_date':
+            values = [v if v is None or isinstance(v, date) else date.fromisoformat(str(v)[:10])
+                      for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=SCHEMA)
+
+
+def write_month(conn, month, archive_dir=ARCHIVE_DIR):
+    """Write one month of orders to its Parquet file; returns the row count"""
+    start, end = _month_bounds(month)
+    path = _partition_path(archive_dir, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {", ".join(SCHEMA.names)} FROM orders
+        WHERE order_date >= %s AND order_date < %s
+        ORDER BY order_date, id
+    ''', (start, end))
+    rows_written = 0
+    try:
+        # Written beside the old file and swapped in, so readers never see half a month
+        with pq.ParquetWriter(path + '.tmp', SCHEMA, compression=COMPRESSION) as writer:
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                writer.write_batch(_record_batch(rows))
+                rows_written += len(rows)
+    finally:
+        cursor.close()
+    os.replace(path + '.tmp', path)
+    return rows_written
+
+
+def archive_months(conn, archive_dir=ARCHIVE_DIR, force=False, today=None):
+    """Archive every closed month that is missing or out of date; returns {month: rows}"""
+    current_month = _month_key(today or date.today())
+    fingerprints = month_fingerprints(conn, before=_month_bounds(current_month)[0])
+    written = {}
+
+    with _lock:
+        os.makedirs(archive_dir, exist_ok=True)
+        manifest = load_manifest(archive_dir)
+        archived = manifest['months']
+
+        for month, fingerprint in sorted(fingerprints.items()):
+            if month >= current_month:
+                continue
+            if not force and archived.get(month, {}).get('fingerprint') == fingerprint:
+                continue
+            written[month] = write_month(conn, month, archive_dir)
+            archived[month] = {
+                'rows': written[month],
+                'fingerprint': fingerprint,
+                'archived_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            _save_manifest(archive_dir, manifest)
+
+        # Months whose orders were all deleted
+        for month in [m for m in archived if m < current_month and m not in fingerprints]:
+            path = _partition_path(archive_dir, month)
+            if os.path.exists(path):
+                os.remove(path)
+            del archived[month]
+            written[month] = 0
+            _save_manifest(archive_dir, manifest)
+
+    return written
+
+
+def archived_months(archive_dir=ARCHIVE_DIR):
+    """Sorted list of months available in the archive"""
+    return sorted(load_manifest(archive_dir)['months'])
+
+
+def read_archive(columns, start_month=None, end_month=None, archive_dir=ARCHIVE_DIR):
+    """Read the given columns for a range of archived months into a DataFrame.
+
+    Only the Parquet files of the requested months are opened, and only the
+    requested columns are decoded.
+    """
+    months = [m for m in archived_months(archive_dir)
+              if (start_month is None or m >= start_month) and (end_month is None or m <= end_month)]
+    paths = [_partition_path(archive_dir, m) for m in months]
+    if not paths:
+        table = SCHEMA.empty_table().select(columns)
+    else:
+        table = ds.dataset(paths, schema=SCHEMA, format='parquet').to_table(columns=columns)
+    # datetime64 columns instead of Python date objects
+    return table.to_pandas(date_as_object=False)
+
+
+def monthly_history(start_month=None, end_month=None, archive_dir=ARCHIVE_DIR):
+    """Orders, revenue and revenue per service for each archived month"""
+    df = read_archive(['order_date', 'total_amount', 'regular_cost', 'blankets_cost', 'white_cost'],
+                      start_month, end_month, archive_dir)
+    months = df['order_date'].to_numpy().astype('datetime64[M]')
+    history = df.drop(columns='order_date').groupby(months).agg(
+        orders=('total_amount', 'size'),
+        revenue=('total_amount', 'sum'),
+        regular_cost=('regular_cost', 'sum'),
+        blankets_cost=('blankets_cost', 'sum'),
+        white_cost=('white_cost', 'sum'),
+    )
+    history.index = pd.DatetimeIndex(history.index).strftime('%Y-%m')
+    history.index.name = 'month'
+    return history.reset_index()
+
+
+def start_archiver(db, archive_dir=ARCHIVE_DIR, interval=ARCHIVE_INTERVAL):
+    """Start the process-wide background archiver for archive_dir (once); returns its thread"""
+    with _lock:
+        thread = _archivers.get(archive_dir)
+        if thread is not None and thread.is_alive():
+            return thread
+
+        def run():
+            while True:
+                try:
+                    with db.connection() as conn:
+                        archive_months(conn, archive_dir)
+                except Exception as e:
+                    print(f"⚠️ Order archive run failed: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=run, name='order-archiver', daemon=True)
+        thread.start()
+        _archivers[archive_dir] = thread
+        return thread
+
+
+def main():
+    """Archive closed months from the command line"""
+    args = sys.argv[1:]
+    archive_dir = args[args.index('--dir') + 1] if '--dir' in args else ARCHIVE_DIR
+
+    print("🧺 Express Wash - Order Archive")
+    print("=" * 50)
+
+    try:
+        with storage.open_database().connection() as conn:
+            written = archive_months(conn, archive_dir, force='--force' in args)
+    except (*storage.DatabaseError, OSError) as e:
+        print(f"❌ Archive failed: {e}")
+        sys.exit(1)
+
+    for month, rows in sorted(written.items()):
+        print(f"✅ {month}: {rows:,} orders" if rows else f"🗑️ {month}: removed (no orders)")
+    print(f"📚 {len(archived_months(archive_dir))} months archived in {archive_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Express Wash Laundry Billing System
+Times the order pipeline, View Orders queries, analytics and exports at several
+dataset sizes against an embedded SQLite database, so it runs without a MySQL
+server. Results are written as JSON; --compare shows how a run differs from an
+earlier one.
+
+Usage: python benchmark.py [--sizes 1000,100000,1000000] [--repeat 5]
+                           [--only NAME,...] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import archive
+import customer_lookup
+import exports
+import migrations
+import order_frame
+import order_queries
+import pricing
+import rollup
+import sample_data
+from repository import OrderRepository
+from sqlite_db import SQLiteDatabase
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 5
+RESULTS_DIR = 'benchmark_results'
+SEED = 2024
+
+SCALAR_BILLS = 10_000      # calculate_bill calls per timing
+SAVED_ORDERS = 100         # orders saved (one transaction each) per timing
+DEEP_PAGES = 10            # pages walked by the keyset pagination benchmark
+EXCEL_MAX_ROWS = 100_000   # openpyxl is too slow to time above this
+
+# Ordered list of (name, function, max_rows); each function returns the number
+# of items it processed
+BENCHMARKS = []
+
+
+def benchmark(name, max_rows=None):
+    """Register a benchmark; it is skipped for datasets larger than max_rows"""
+    def register(func):
+        BENCHMARKS.append((name, func, max_rows))
+        return func
+    return register
+
+
+class Context:
+    """A populated database plus the frames the pandas benchmarks work on"""
+
+    def __init__(self, db, size):
+        self.db = db
+        self.size = size
+        self.orders = None
+        self.summary = None
+        self.customer_index = None
+        self.archive_dir = None
+
+
+# Pricing
+
+@benchmark('calculate_bill')
+def bench_calculate_bill(ctx):
+    for i in range(SCALAR_BILLS):
+        pricing.calculate_bill(i % 7 * 0.5, i % 3 * 0.5, i % 11)
+    return SCALAR_BILLS
+
+
+@benchmark('price_orders')
+def bench_price_orders(ctx):
+    pricing.price_orders(ctx.orders)
+    return len(ctx.orders)
+
+
+@benchmark('simulate_prices')
+def bench_simulate_prices(ctx):
+    pricing.simulate(ctx.orders, {'regular_clothes': 55, 'blankets': 110, 'white_clothes': 45})
+    return len(ctx.orders)
+
+
+# Loading and View Orders
+
+@benchmark('load_orders')
+def bench_load_orders(ctx):
+    with ctx.db.connection() as conn:
+        df = order_frame.load_orders(conn)
+    return len(df)
+
+
+@benchmark('load_orders_untyped')
+def bench_load_orders_untyped(ctx):
+    with ctx.db.connection() as conn:
+        df = pd.read_sql_query('SELECT * FROM orders ORDER BY created_at DESC', conn)
+    return len(df)
+
+
+def _view_page(ctx, filters):
+    with ctx.db.connection() as conn:
+        order_queries.count_orders(conn, filters)
+        page, _ = order_queries.fetch_orders_page(conn, filters)
+    return len(page)
+
+
+@benchmark('view_first_page')
+def bench_view_first_page(ctx):
+    return _view_page(ctx, order_queries.build_filters())
+
+
+@benchmark('view_name_filter')
+def bench_view_name_filter(ctx):
+    return _view_page(ctx, order_queries.build_filters(search_name='amit'))
+
+
+@benchmark('view_date_filter')
+def bench_view_date_filter(ctx):
+    day = ctx.summary['summary_date'].iloc[len(ctx.summary) // 2]
+    return _view_page(ctx, order_queries.build_filters(order_date=day, min_amount=200))
+
+
+@benchmark('view_deep_pages')
+def bench_view_deep_pages(ctx):
+    filters = order_queries.build_filters()
+    rows = 0
+    after = None
+    with ctx.db.connection() as conn:
+        for _ in range(DEEP_PAGES):
+            page, after = order_queries.fetch_orders_page(conn, filters, after=after)
+            rows += len(page)
+            if after is None:
+                break
+    return rows
+
+
+@benchmark('view_fetch_filtered')
+def bench_view_fetch_filtered(ctx):
+    with ctx.db.connection() as conn:
+        df = order_queries.fetch_filtered_orders(conn, order_queries.build_filters(min_amount=500))
+    return len(df)
+
+
+@benchmark('order_picker_search')
+def bench_order_picker_search(ctx):
+    # A receipt number, an id, a name, a phone prefix and a term matching nothing, as
+    # typed into the Edit/Delete picker (the app caches the customer index per data version)
+    middle = ctx.orders.iloc[len(ctx.orders) // 2]
+    terms = [middle['receipt_number'], str(middle['id']), 'amit', str(middle['mobile_number'])[:5], 'qqqq']
+    with ctx.db.connection() as conn:
+        return sum(len(order_queries.search_orders(conn, term, customer_index=ctx.customer_index))
+                   for term in terms)
+
+
+# Analytics
+
+@benchmark('load_daily_summary')
+def bench_load_daily_summary(ctx):
+    with ctx.db.connection() as conn:
+        return len(rollup.load_daily_summary(conn))
+
+
+@benchmark('key_metrics')
+def bench_key_metrics(ctx):
+    with ctx.db.connection() as conn:
+        analytics.key_metrics(conn)
+    return ctx.size
+
+
+@benchmark('service_revenue')
+def bench_service_revenue(ctx):
+    with ctx.db.connection() as conn:
+        analytics.service_revenue(conn)
+    return ctx.size
+
+
+@benchmark('top_customers')
+def bench_top_customers(ctx):
+    with ctx.db.connection() as conn:
+        analytics.top_customers(conn)
+    return ctx.size
+
+
+@benchmark('recent_orders')
+def bench_recent_orders(ctx):
+    with ctx.db.connection() as conn:
+        return len(analytics.recent_orders(conn))
+
+
+@benchmark('analytics_dashboard')
+def bench_analytics_dashboard(ctx):
+    analytics.dashboard(ctx.db)
+    return ctx.size
+
+
+@benchmark('analytics_dashboard_serial')
+def bench_analytics_dashboard_serial(ctx):
+    analytics.dashboard(ctx.db, workers=1)
+    return ctx.size
+
+
+# Order archive
+
+@benchmark('archive_months')
+def bench_archive_months(ctx):
+    with ctx.db.connection() as conn:
+        written = archive.archive_months(conn, ctx.archive_dir, force=True)
+    return sum(written.values())
+
+
+@benchmark('archive_history')
+def bench_archive_history(ctx):
+    if not archive.archived_months(ctx.archive_dir):
+        with ctx.db.connection() as conn:
+            archive.archive_months(conn, ctx.archive_dir)
+    return int(archive.monthly_history(archive_dir=ctx.archive_dir)['orders'].sum())
+
+
+# Exports
+
+@benchmark('export_csv')
+def bench_export_csv(ctx):
+    with ctx.db.connection() as conn:
+        path, rows = exports.export_orders_csv(conn)
+    os.remove(path)
+    return rows
+
+
+@benchmark('export_csv_gzip')
+def bench_export_csv_gzip(ctx):
+    with ctx.db.connection() as conn:
+        path, rows = exports.export_orders_csv(conn, compress=True)
+    os.remove(path)
+    return rows
+
+
+@benchmark('export_excel', max_rows=EXCEL_MAX_ROWS)
+def bench_export_excel(ctx):
+    with ctx.db.connection() as conn:
+        path, counts = exports.export_orders_xlsx(conn)
+    os.remove(path)
+    return sum(counts.values())
+
+
+# Writes run last so the other benchmarks see the dataset at its nominal size
+
+@benchmark('save_order')
+def bench_save_order(ctx):
+    # The same repository call the New Order pages make
+    repository = OrderRepository(ctx.db)
+    for i in range(SAVED_ORDERS):
+        bill = pricing.calculate_bill(2.5, 1.0, i % 5)
+        repository.save_order({
+            'customer_name': 'Benchmark Customer', 'mobile_number': '9000000000',
+            'order_date': date.today(), 'regular_clothes_kg': 2.5, 'blankets_kg': 1.0,
+            'white_clothes_pieces': i % 5, 'total_amount': bill['total'],
+        })
+    return SAVED_ORDERS
+
+
+def build_dataset(path, size):
+    """Create and fill a benchmark database; returns (db, seconds)"""
+    started = time.perf_counter()
+    db = SQLiteDatabase(path)
+    with db.connection() as conn:
+        migrations.migrate(conn)
+        customers = sample_data.make_customers(max(100, size // 20), SEED)
+        blocks = sample_data.generate_orders(size, customers, date(2023, 1, 1), 730, seed=SEED)
+        sample_data.insert_orders(conn, blocks, size, progress=False)
+        rollup.rebuild(conn)
+    return db, time.perf_counter() - started
+
+
+def time_benchmark(func, ctx, repeat):
+    """Run func repeat times; returns timing statistics in milliseconds"""
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = func(ctx)
+        timings.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(timings)
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(median, 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'stdev_ms': round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        'items': items,
+        'items_per_second': round(items / (median / 1000), 1) if median else None,
+    }
+
+
+def run(sizes, repeat, only=None):
+    """Run every benchmark at every size; returns the results document"""
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'backend': 'sqlite',
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sqlite': sqlite3.sqlite_version,
+        },
+        'repeat': repeat,
+        'sizes': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            print(f"\n📦 Building dataset with {size:,} orders...")
+            db, setup_seconds = build_dataset(os.path.join(workdir, f'bench_{size}.db'), size)
+            print(f"✅ Dataset ready in {setup_seconds:.1f}s")
+
+            ctx = Context(db, size)
+            ctx.archive_dir = os.path.join(workdir, f'archive_{size}')
+            with db.connection() as conn:
+                ctx.orders = order_frame.load_orders(conn)
+                ctx.summary = rollup.load_daily_summary(conn)
+                ctx.customer_index = customer_lookup.load_customers(conn)
+
+            size_results = {'setup_seconds': round(setup_seconds, 3), 'benchmarks': {}}
+            for name, func, max_rows in BENCHMARKS:
+                if only and name not in only:
+                    continue
+                if max_rows is not None and size > max_rows:
+                    size_results['benchmarks'][name] = {'skipped': f'more than {max_rows:,} rows'}
+                    print(f"⏭️  {name:<22} skipped")
+                    continue
+                stats = time_benchmark(func, ctx, repeat)
+                size_results['benchmarks'][name] = stats
+                print(f"⏱️  {name:<22} {stats['median_ms']:>10.2f} ms  ({stats['items_per_second'] or 0:,.0f} items/s)")
+
+            results['sizes'][str(size)] = size_results
+            db.close()
+
+    return results
+
+
+def compare(old, new):
+    """Print the median change of every benchmark present in both runs"""
+    print(f"\n📊 Compared with run from {old.get('created_at', '?')}")
+    print(f"{'benchmark':<22} {'size':>10} {'before ms':>12} {'after ms':>12} {'change':>9}")
+    for size, size_results in new['sizes'].items():
+        old_benchmarks = old.get('sizes', {}).get(size, {}).get('benchmarks', {})
+        for name, stats in size_results['benchmarks'].items():
+            before = old_benchmarks.get(name, {}).get('median_ms')
+            after = stats.get('median_ms')
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            marker = '🟢' if change < -5 else '🔴' if change > 5 else '  '
+            print(f"{name:<22} {int(size):>10,} {before:>12.2f} {after:>12.2f} {change:>+8.1f}% {marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Express Wash order pipeline")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated dataset sizes (default 1000,100000,1000000)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timings per benchmark")
+    parser.add_argument('--only', help="comma-separated benchmark names to run")
+    parser.add_argument('--output', help=f"results file (default {RESULTS_DIR}/benchmark-<time>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    only = set(args.only.split(',')) if args.only else None
+    unknown = (only or set()) - {name for name, _, _ in BENCHMARKS}
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    print("🧺 Express Wash - Benchmark Suite")
+    print("=" * 50)
+
+    # pandas warns about non-SQLAlchemy connections on every read_sql_query
+    warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+    results = run(sizes, args.repeat, only)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
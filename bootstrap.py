@@ -0,0 +1,45 @@
+"""
+Database Bootstrap for Express Wash Laundry Billing System
+Verifies the database and schema once per server process instead of on every
+Streamlit rerun. Verification is repeated only after the connection pool has
+seen a connection failure, since that is when the server may have changed.
+"""
+
+import threading
+
+import migrations
+import storage
+
+# Per-pool verification state: pool -> connection_errors count at last check
+_verified = {}
+_lock = threading.Lock()
+
+
+def _needs_check(pool):
+    mark = _verified.get(id(pool))
+    return mark is None or pool.stats()['connection_errors'] != mark
+
+
+def ensure_schema(pool, create_database=False):
+    """Make sure the database exists and is migrated; returns True if a check ran"""
+    if not _needs_check(pool):
+        return False
+
+    with _lock:
+        # Another thread may have finished the check while we waited
+        if not _needs_check(pool):
+            return False
+
+        if create_database:
+            storage.create_database(pool)
+        with pool.connection() as conn:
+            migrations.migrate(conn)
+
+        _verified[id(pool)] = pool.stats()['connection_errors']
+        return True
+
+
+def reset():
+    """Forget previous checks so the next call verifies again"""
+    with _lock:
+        _verified.clear()
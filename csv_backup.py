@@ -0,0 +1,208 @@
+"""
+CSV Backup for Express Wash Laundry Billing System
+Keeps orders.csv in step with the database without rewriting it on every write:
+new orders are appended as single lines, edits and deletes go to a journal, and
+the journal is folded into a fresh snapshot once it grows large or old.
+"""
+
+import csv
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Backup file locations
+SNAPSHOT_FILE = 'orders.csv'
+JOURNAL_FILE = 'orders_journal.csv'
+LOCK_FILE = 'orders.csv.lock'
+
+# Compaction schedule: whichever limit is reached first
+COMPACT_JOURNAL_BYTES = 256 * 1024   # ~2,500 journal entries
+COMPACT_INTERVAL = 24 * 60 * 60      # fold the journal at least once a day
+
+BACKUP_COLUMNS = [
+    'id', 'receipt_number', 'customer_name', 'mobile_number', 'order_date', 'regular_clothes_kg',
+    'blankets_kg', 'white_clothes_pieces', 'total_amount'
+]
+JOURNAL_COLUMNS = ['op', 'logged_at'] + BACKUP_COLUMNS
+
+
+@contextmanager
+def _locked():
+    """Hold an exclusive lock on the backup files across processes"""
+    with open(LOCK_FILE, 'a+') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_header(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), None)
+
+
+def _append_row(path, columns, row):
+    """Append one row, writing the header first if the file is new"""
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        if write_header:
+            writer.writeheader()
+        writer.writerow(row)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _backup_row(order_id, order_data):
+    row = {column: order_data.get(column, '') for column in BACKUP_COLUMNS}
+    row['id'] = order_id
+    return row
+
+
+def append_order(order_id, order_data):
+    """Append a newly saved order to the snapshot as a single line"""
+    with _locked():
+        header = _read_header(SNAPSHOT_FILE)
+        if header is not None and header != BACKUP_COLUMNS:
+            # Older backups lack newer columns (e.g. id); rewrite once so edits can find rows
+            _compact_locked()
+        _append_row(SNAPSHOT_FILE, BACKUP_COLUMNS, _backup_row(order_id, order_data))
+        _maybe_compact_locked()
+
+
+def append_orders(orders):
+    """Append many saved orders at once; orders is a list of (order_id, order_data)"""
+    if not orders:
+        return
+    with _locked():
+        header = _read_header(SNAPSHOT_FILE)
+        if header is not None and header != BACKUP_COLUMNS:
+            _compact_locked()
+        with open(SNAPSHOT_FILE, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=BACKUP_COLUMNS, extrasaction='ignore')
+            if f.tell() == 0:
+                writer.writeheader()
+            writer.writerows(_backup_row(order_id, order_data) for order_id, order_data in orders)
+            f.flush()
+            os.fsync(f.fileno())
+        _maybe_compact_locked()
+
+
+def record_update(order_id, order_data):
+    """Journal an edit to an existing order"""
+    _journal('update', _backup_row(order_id, order_data))
+
+
+def record_delete(order_id):
+    """Journal the deletion of an order"""
+    _journal('delete', {'id': order_id})
+
+
+def _journal(op, row):
+    entry = dict(row, op=op, logged_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    with _locked():
+        header = _read_header(JOURNAL_FILE)
+        if header is not None and header != JOURNAL_COLUMNS:
+            # Fold a journal written with an older column layout before appending
+            _compact_locked()
+        _append_row(JOURNAL_FILE, JOURNAL_COLUMNS, entry)
+        _maybe_compact_locked()
+
+
+def _journal_is_due():
+    if not os.path.exists(JOURNAL_FILE):
+        return False
+    if os.path.getsize(JOURNAL_FILE) >= COMPACT_JOURNAL_BYTES:
+        return True
+
+    # Only the oldest entry is needed to know how long the journal has been open
+    with open(JOURNAL_FILE, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        first = next(reader, None)
+    if first is None:
+        return False
+    try:
+        opened = datetime.strptime(first['logged_at'], '%Y-%m-%d %H:%M:%S').timestamp()
+    except (KeyError, TypeError, ValueError):
+        return True
+    return time.time() - opened >= COMPACT_INTERVAL
+
+
+def _maybe_compact_locked():
+    if _journal_is_due():
+        _compact_locked()
+
+
+def compact():
+    """Fold the journal into a fresh snapshot"""
+    with _locked():
+        return _compact_locked()
+
+
+def _compact_locked():
+    rows = []
+    if os.path.exists(SNAPSHOT_FILE):
+        with open(SNAPSHOT_FILE, newline='', encoding='utf-8') as f:
+            rows = [{column: row.get(column, '') or '' for column in BACKUP_COLUMNS}
+                    for row in csv.DictReader(f)]
+
+    journal_entries = 0
+    if os.path.exists(JOURNAL_FILE):
+        positions = {row['id']: i for i, row in enumerate(rows) if row['id']}
+        with open(JOURNAL_FILE, newline='', encoding='utf-8') as f:
+            for entry in csv.DictReader(f):
+                journal_entries += 1
+                i = positions.get(entry['id'])
+                if i is None or rows[i] is None:
+                    continue
+                if entry['op'] == 'delete':
+                    rows[i] = None
+                elif entry['op'] == 'update':
+                    updated = {column: entry.get(column, '') or '' for column in BACKUP_COLUMNS}
+                    # Receipt numbers never change; edits do not carry them
+                    updated['receipt_number'] = updated['receipt_number'] or rows[i]['receipt_number']
+                    rows[i] = updated
+
+    # Write the new snapshot next to the old one and swap atomically
+    tmp_file = SNAPSHOT_FILE + '.tmp'
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=BACKUP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(row for row in rows if row is not None)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, SNAPSHOT_FILE)
+
+    if os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+    return journal_entries
+
+
+if __name__ == "__main__":
+    print("🧺 Express Wash - CSV Backup Compaction")
+    print("=" * 50)
+    try:
+        applied = compact()
+    except OSError as e:
+        print(f"❌ Error compacting backup: {e}")
+        sys.exit(1)
+    print(f"✅ Applied {applied} journal entries to {SNAPSHOT_FILE}")
@@ -0,0 +1,161 @@
+"""
+Customer Lookup for Express Wash Laundry Billing System
+Fuzzy index over distinct customers, shared by the Streamlit and Tkinter apps.
+Names are normalized (case, stray spaces) before indexing; candidates are found
+through shared trigrams and the best few are ranked by edit distance, so a
+query like "babitha bhujbal" still finds "babita bhujal ".
+"""
+
+import numpy as np
+
+CUSTOMERS_SQL = '''
+    SELECT customer_name, mobile_number, COUNT(*) AS order_count, MAX(order_date) AS last_order_date
+    FROM orders
+    GROUP BY customer_name, mobile_number
+'''
+
+DEFAULT_LIMIT = 10
+CANDIDATES_PER_RESULT = 5   # trigram candidates re-ranked by edit distance per result
+MIN_SCORE = 0.4
+
+
+def normalize_name(name):
+    """Lowercase and collapse whitespace: ' Babita  Bhujal ' -> 'babita bhujal'"""
+    return ' '.join(str(name or '').split()).lower()
+
+
+def normalize_mobile(mobile):
+    return ''.join(ch for ch in str(mobile or '') if ch.isdigit())
+
+
+def _grams(text):
+    # Padding makes word starts count, so short names still have trigrams
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit=None):
+    """Levenshtein distance; stops early once it must exceed limit"""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _similarity(query, name):
+    """1.0 for an exact match; also credits a query that matches one word or the start of the name"""
+    best = 0.0
+    for target in [name, name[:len(query)]] + name.split():
+        longest = max(len(query), len(target))
+        if not longest:
+            continue
+        limit = int(longest * (1 - best))
+        distance = edit_distance(query, target, limit)
+        best = max(best, 1 - distance / longest)
+    return best
+
+
+class CustomerIndex:
+    """Ranked fuzzy lookup of customers by name or mobile number"""
+
+    def __init__(self, records):
+        # Merge spellings that only differ in case or spacing
+        merged = {}
+        for name, mobile, order_count, last_order_date in records:
+            key = (normalize_name(name), normalize_mobile(mobile))
+            if not key[0]:
+                continue
+            customer = merged.get(key)
+            if customer is None:
+                merged[key] = {
+                    'customer_name': ' '.join(str(name).split()),
+                    'mobile_number': mobile or '',
+                    'order_count': int(order_count),
+                    'last_order_date': last_order_date,
+                    'stored_names': [name],   # spellings as stored, for exact SQL lookups
+                }
+            else:
+                if name not in customer['stored_names']:
+                    customer['stored_names'].append(name)
+                customer['order_count'] += int(order_count)
+                if last_order_date and (not customer['last_order_date']
+                                        or last_order_date > customer['last_order_date']):
+                    customer['last_order_date'] = last_order_date
+
+        self.customers = list(merged.values())
+        self._names = [key[0] for key in merged]
+        self._mobiles = [key[1] for key in merged]
+
+        # Inverted index: trigram -> array of customer positions
+        postings = {}
+        for position, name in enumerate(self._names):
+            for gram in _grams(name):
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.array(positions, dtype=np.int32)
+                          for gram, positions in postings.items()}
+        self._gram_counts = np.array([len(_grams(name)) for name in self._names], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.customers)
+
+    def memory_usage(self, deep=True):
+        """Approximate bytes held, so the data cache can account for the index"""
+        arrays = sum(postings.nbytes for postings in self._postings.values())
+        strings = sum(len(name) + len(mobile) + 100 for name, mobile in zip(self._names, self._mobiles))
+        return arrays + self._gram_counts.nbytes + strings + 400 * len(self.customers)
+
+    def search(self, query, limit=DEFAULT_LIMIT, min_score=MIN_SCORE):
+        """Return up to limit (customer, score) pairs, best match first"""
+        # A query made of digits (and phone punctuation) is a mobile number
+        compact = str(query).strip().lstrip('+').replace(' ', '').replace('-', '')
+        if compact.isdigit():
+            return self._search_mobile(compact, limit)
+
+        query = normalize_name(query)
+        if not query or not self.customers:
+            return []
+
+        # Count shared trigrams for every customer in one vectorized pass
+        query_grams = _grams(query)
+        hits = [self._postings[gram] for gram in query_grams if gram in self._postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.customers))
+        dice = 2.0 * shared / (len(query_grams) + self._gram_counts)
+
+        count = min(len(self.customers), max(limit * CANDIDATES_PER_RESULT, 20))
+        candidates = np.argpartition(-dice, count - 1)[:count] if count < len(dice) else np.arange(len(dice))
+
+        results = []
+        for position in candidates:
+            if shared[position] == 0:
+                continue
+            score = max(_similarity(query, self._names[position]), float(dice[position]))
+            if score >= min_score:
+                results.append((score, self.customers[position]['order_count'], int(position)))
+        results.sort(reverse=True)
+        return [(self.customers[position], round(score, 3)) for score, _, position in results[:limit]]
+
+    def _search_mobile(self, digits, limit):
+        results = [(1.0 if mobile == digits else 0.9, self.customers[i]['order_count'], i)
+                   for i, mobile in enumerate(self._mobiles) if digits in mobile]
+        results.sort(reverse=True)
+        return [(self.customers[i], score) for score, _, i in results[:limit]]
+
+
+def load_customers(conn):
+    """Build a CustomerIndex from the orders table"""
+    cursor = conn.cursor()
+    cursor.execute(CUSTOMERS_SQL)
+    records = cursor.fetchall()
+    cursor.close()
+    return CustomerIndex(records)
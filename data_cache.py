@@ -0,0 +1,125 @@
+"""
+Data Cache for Express Wash Laundry Billing System
+Keeps query results in memory between Streamlit reruns. Every entry is tagged
+with the data version it was loaded at; writes bump the version, which makes
+all older entries stale without having to know which queries they affect.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 300                        # seconds before an entry is reloaded anyway
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024    # memory ceiling for all entries of one cache
+
+# Named caches shared by the whole process
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _size_of(value):
+    """Estimate the memory held by a cached value, including what its containers hold"""
+    footprint = getattr(value, 'attrs', {}).get('memory_footprint')
+    if footprint and footprint['rows'] == len(value) and list(footprint['columns']) == list(getattr(value, 'columns', [])):
+        # Measured when order_frame loaded it; slices inherit attrs, hence the shape check
+        return footprint['total']
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        except TypeError:
+            pass
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_size_of(k) + _size_of(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_size_of(item) for item in value)
+    return size
+
+
+class DataCache:
+    """Version-keyed, TTL-bounded, size-capped cache with hit/miss counters"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._version = 0
+        self._entries = OrderedDict()   # key -> (version, loaded_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'uncacheable': 0}
+
+    @property
+    def version(self):
+        return self._version
+
+    def bump_version(self):
+        """Mark every cached entry as stale after the underlying data changed"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._bytes = 0
+            return self._version
+
+    def get(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, loaded_at, value, size = entry
+                if version == self._version and time.monotonic() - loaded_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                self._stats['expired'] += 1
+                self._drop(key)
+            self._stats['misses'] += 1
+            version = self._version
+
+        # Load outside the lock so slow queries do not block other sessions
+        value = loader()
+        size = _size_of(value)
+
+        with self._lock:
+            if version != self._version:
+                # A write landed while we were loading; serve but do not keep it
+                return value
+            if size > self.max_bytes:
+                self._stats['uncacheable'] += 1
+                return value
+            self._drop(key)
+            self._entries[key] = (version, time.monotonic(), value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats['evictions'] += 1
+        return value
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def stats(self):
+        """Return a snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['version'] = self._version
+            snapshot['entries'] = len(self._entries)
+            snapshot['bytes'] = self._bytes
+        lookups = snapshot['hits'] + snapshot['misses']
+        snapshot['hit_rate'] = snapshot['hits'] / lookups if lookups else 0.0
+        return snapshot
+
+
+def get_cache(name, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+    """Return the process-wide cache with this name, creating it once"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = DataCache(ttl=ttl, max_bytes=max_bytes)
+            _caches[name] = cache
+        return cache
@@ -0,0 +1,194 @@
+"""
+Connection Pool for Express Wash Laundry Billing System
+Keeps a process-wide set of open MySQL connections so every data-access
+call reuses an authenticated session instead of opening a new one.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+
+# Default pool settings (can be overridden per pool)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_CHECKOUT_TIMEOUT = 10        # seconds to wait for a free connection
+DEFAULT_HEALTH_CHECK_INTERVAL = 30   # seconds a connection may sit idle before it is pinged
+
+# One pool per distinct database configuration, shared by the whole process
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeoutError(mysql.connector.errors.PoolError):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections with health checks and statistics"""
+
+    dialect = 'mysql'
+
+    def __init__(self, db_config, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL):
+        self.db_config = dict(db_config)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # Idle connections as (connection, last_used) pairs; None marks a slot
+        # that has not been connected yet so connections are opened lazily
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._idle.put((None, 0.0))
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'discarded': 0,
+            'connection_errors': 0,
+            'in_use': 0,
+            'max_wait_ms': 0.0,
+            'total_wait_ms': 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.db_config)
+        self._count('connects')
+        return conn
+
+    def _ensure_healthy(self, conn, last_used):
+        """Return a usable connection, reconnecting it if it has gone stale"""
+        if conn is None:
+            return self._connect()
+
+        if time.monotonic() - last_used < self.health_check_interval:
+            return conn
+
+        try:
+            conn.ping(reconnect=False)
+            return conn
+        except mysql.connector.Error:
+            self._count('reconnects')
+            self._close_quietly(conn)
+            return self._connect()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _checkout(self):
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            self._count('waits')
+            started = time.monotonic()
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                self._count('timeouts')
+                raise PoolTimeoutError(
+                    msg=f"No database connection available after {self.timeout}s "
+                        f"(pool size {self.pool_size})"
+                )
+            waited_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                self._stats['total_wait_ms'] += waited_ms
+                self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], waited_ms)
+
+        try:
+            conn = self._ensure_healthy(conn, last_used)
+        except mysql.connector.Error:
+            # Give the slot back so a failed connect does not shrink the pool
+            self._count('connection_errors')
+            self._idle.put((None, 0.0))
+            raise
+
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+        return conn
+
+    def _checkin(self, conn, broken=False):
+        with self._lock:
+            self._stats['in_use'] -= 1
+
+        if broken:
+            self._count('discarded')
+            self._close_quietly(conn)
+            self._idle.put((None, 0.0))
+            return
+
+        try:
+            # Never hand the next caller an open transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            self._count('discarded')
+            self._close_quietly(conn)
+            self._idle.put((None, 0.0))
+            return
+
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block"""
+        conn = self._checkout()
+        broken = False
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError,
+                mysql.connector.errors.InterfaceError):
+            # Lost connections are not returned to the pool
+            broken = True
+            self._count('connection_errors')
+            raise
+        finally:
+            self._checkin(conn, broken=broken)
+
+    def stats(self):
+        """Return a snapshot of pool usage counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot['pool_size'] = self.pool_size
+        snapshot['idle'] = self._idle.qsize()
+        waits = snapshot['waits'] - snapshot['timeouts']
+        snapshot['avg_wait_ms'] = snapshot['total_wait_ms'] / waits if waits else 0.0
+        return snapshot
+
+    def close(self):
+        """Close every idle connection held by the pool"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                self._close_quietly(conn)
+
+
+def get_pool(db_config, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT,
+             health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL):
+    """Return the process-wide pool for this database configuration, creating it once"""
+    key = tuple(sorted((k, str(v)) for k, v in db_config.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_config, pool_size=pool_size, timeout=timeout,
+                                  health_check_interval=health_check_interval)
+            _pools[key] = pool
+        return pool
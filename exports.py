@@ -0,0 +1,162 @@
+"""
+Order Exports for Express Wash Laundry Billing System
+Streams matching orders from the database straight into a file, a chunk of
+rows at a time, so an export never holds the whole result set in memory.
+CSV files hold the orders; Excel reports also get daily and per-customer
+totals and are written with openpyxl's write-only (streaming) workbook.
+"""
+
+import csv
+import gzip
+import os
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+import order_queries
+
+EXPORT_CHUNK_SIZE = 5000   # rows fetched from the cursor per write
+EXCEL_MAX_ROWS = 1_048_576  # rows per worksheet, header included
+
+DAILY_TOTALS_SQL = '''
+    SELECT order_date, COUNT(*) AS order_count, SUM(total_amount) AS revenue,
+           SUM(regular_clothes_kg) AS regular_clothes_kg, SUM(blankets_kg) AS blankets_kg,
+           SUM(white_clothes_pieces) AS white_clothes_pieces
+    FROM orders
+    WHERE {where_sql}
+    GROUP BY order_date
+    ORDER BY order_date
+'''
+
+CUSTOMER_TOTALS_SQL = '''
+    SELECT customer_name, mobile_number, COUNT(*) AS order_count, SUM(total_amount) AS revenue,
+           MIN(order_date) AS first_order, MAX(order_date) AS last_order
+    FROM orders
+    WHERE {where_sql}
+    GROUP BY customer_name, mobile_number
+    ORDER BY revenue DESC
+'''
+
+
+def _export_query(filters):
+    where_sql, params = filters
+    query = f'''
+        SELECT {", ".join(order_queries.ORDER_COLUMNS)} FROM orders
+        WHERE {where_sql}
+        ORDER BY created_at DESC, id DESC
+    '''
+    return query, params
+
+
+def write_orders_csv(conn, path, filters=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write the orders matching filters to path as CSV (gzip if compress); returns the row count.
+
+    The cursor is unbuffered on MySQL, so rows come from the server as they
+    are written instead of all at once.
+    """
+    query, params = _export_query(filters or order_queries.build_filters())
+    opener = gzip.open if compress else open
+    rows_written = 0
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        with opener(path, 'wt', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([d[0] for d in cursor.description])
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                rows_written += len(rows)
+    finally:
+        cursor.close()
+    return rows_written
+
+
+def _new_sheet(workbook, title, header):
+    sheet = workbook.create_sheet(title)
+    cells = []
+    for name in header:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = Font(bold=True)
+        cells.append(cell)
+    sheet.append(cells)
+    return sheet
+
+
+def _append_sheets(workbook, title, cursor, chunk_size):
+    """Stream a cursor's rows into worksheets, continuing on a new one when a sheet is full"""
+    header = [d[0] for d in cursor.description]
+    sheet = _new_sheet(workbook, title, header)
+    sheet_rows = 1
+    part = 1
+    rows_written = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            if sheet_rows == EXCEL_MAX_ROWS:
+                part += 1
+                sheet = _new_sheet(workbook, f"{title} ({part})", header)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        rows_written += len(rows)
+    return rows_written
+
+
+def write_orders_xlsx(conn, path, filters=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write an Excel report of the orders matching filters; returns rows written per sheet.
+
+    Sheets: the orders (continued on extra sheets past Excel's row limit),
+    totals per order date and totals per customer.
+    """
+    filters = filters or order_queries.build_filters()
+    where_sql, params = filters
+    workbook = Workbook(write_only=True)
+    counts = {}
+
+    cursor = conn.cursor()
+    try:
+        for title, (query, query_params) in [
+            ('Orders', _export_query(filters)),
+            ('Daily Summary', (DAILY_TOTALS_SQL.format(where_sql=where_sql), params)),
+            ('Customer Totals', (CUSTOMER_TOTALS_SQL.format(where_sql=where_sql), params)),
+        ]:
+            cursor.execute(query, query_params)
+            counts[title] = _append_sheets(workbook, title, cursor, chunk_size)
+    finally:
+        cursor.close()
+
+    workbook.save(path)
+    return counts
+
+
+def _temporary_export(suffix, write):
+    """Run write(path) on a new temporary file; returns (path, result).
+
+    The caller owns the file and should delete it once it has been sent.
+    """
+    fd, path = tempfile.mkstemp(prefix='express_wash_orders_', suffix=suffix)
+    os.close(fd)
+    try:
+        return path, write(path)
+    except Exception:
+        os.remove(path)
+        raise
+
+
+def export_orders_csv(conn, filters=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Export matching orders to a temporary CSV file; returns (path, row count)"""
+    return _temporary_export('.csv.gz' if compress else '.csv',
+                             lambda path: write_orders_csv(conn, path, filters, compress, chunk_size))
+
+
+def export_orders_xlsx(conn, filters=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Export an Excel report of matching orders to a temporary file; returns (path, rows per sheet)"""
+    return _temporary_export('.xlsx', lambda path: write_orders_xlsx(conn, path, filters, chunk_size))
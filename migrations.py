@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations for Express Wash Laundry Billing System
+Single source of truth for the database schema. Each migration runs once, in
+version order, and is recorded in the schema_version table so existing
+installs only apply what they are missing.
+"""
+
+import sys
+
+import mysql.connector
+
+import pricing
+import receipts
+import rollup
+import sqlite_db
+import storage
+
+# Ordered list of (version, description, function)
+MIGRATIONS = []
+
+# Serializes concurrent runners (e.g. two Streamlit workers starting together);
+# on SQLite the seconds to wait for another runner's transaction
+LOCK_NAME = 'express_wash_migrations'
+LOCK_TIMEOUT = 30
+
+
+def migration(version, description):
+    """Register a migration function under a schema version"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return register
+
+
+def _dialect(cursor):
+    """'mysql', or 'sqlite' for connections from sqlite_db"""
+    return getattr(cursor, 'dialect', 'mysql')
+
+
+def _column_exists(cursor, table, column):
+    if _dialect(cursor) == 'sqlite':
+        cursor.execute(f'PRAGMA table_info({table})')
+        return any(row[1] == column for row in cursor.fetchall())
+    cursor.execute('''
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    ''', (table, column))
+    return cursor.fetchone() is not None
+
+
+def _index_exists(cursor, table, index):
+    if _dialect(cursor) == 'sqlite':
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+                       (table, index))
+        return cursor.fetchone() is not None
+    cursor.execute('''
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    ''', (table, index))
+    return cursor.fetchone() is not None
+
+
+@migration(1, "create orders table")
+def _create_orders(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            customer_name VARCHAR(255) NOT NULL,
+            mobile_number VARCHAR(20),
+            order_date DATE NOT NULL,
+            regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
+            blankets_kg DECIMAL(5,2) DEFAULT 0,
+            white_clothes_pieces INT DEFAULT 0,
+            total_amount DECIMAL(10,2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+@migration(2, "add receipt numbers")
+def _add_receipt_number(cursor):
+    # Installs created by the desktop app already have this column
+    if not _column_exists(cursor, 'orders', 'receipt_number'):
+        if _dialect(cursor) == 'sqlite':
+            # SQLite cannot add a UNIQUE column; a unique index does the same job
+            cursor.execute('ALTER TABLE orders ADD COLUMN receipt_number VARCHAR(32)')
+            cursor.execute('CREATE UNIQUE INDEX idx_orders_receipt_number ON orders (receipt_number)')
+        else:
+            cursor.execute('ALTER TABLE orders ADD COLUMN receipt_number VARCHAR(32) UNIQUE')
+
+
+@migration(3, "create daily summary rollup")
+def _create_daily_summary(cursor):
+    cursor.execute(rollup.CREATE_TABLE_SQL)
+    cursor.execute('SELECT 1 FROM daily_summary LIMIT 1')
+    if cursor.fetchone() is None:
+        cursor.execute(rollup.REBUILD_SQL)
+
+
+@migration(4, "index hot order queries")
+def _add_order_indexes(cursor):
+    indexes = {
+        # View Orders sort order and keyset pagination
+        'idx_orders_created_at': '(created_at, id)',
+        # Date filter
+        'idx_orders_order_date': '(order_date)',
+        # Name and phone lookups
+        'idx_orders_customer_name': '(customer_name)',
+        'idx_orders_mobile_number': '(mobile_number)',
+    }
+    for name, columns in indexes.items():
+        if not _index_exists(cursor, 'orders', name):
+            cursor.execute(f'CREATE INDEX {name} ON orders {columns}')
+
+
+@migration(5, "create receipt number sequences")
+def _create_receipt_sequences(cursor):
+    cursor.execute(receipts.CREATE_TABLE_SQL)
+    cursor.execute(receipts.SEED_SQL)
+
+
+@migration(6, "store per-service amounts and price list version")
+def _add_line_amounts(cursor):
+    for column in pricing.COST_COLUMNS:
+        if not _column_exists(cursor, 'orders', column):
+            cursor.execute(f'ALTER TABLE orders ADD COLUMN {column} DECIMAL(10,2) NOT NULL DEFAULT 0')
+    if not _column_exists(cursor, 'orders', 'pricing_version'):
+        cursor.execute('ALTER TABLE orders ADD COLUMN pricing_version INT')
+
+    # Every order so far was billed at the first price list
+    rates = pricing.PRICE_LISTS[1]
+    cursor.execute('''
+        UPDATE orders
+        SET regular_cost = ROUND(regular_clothes_kg * %s, 2),
+            blankets_cost = ROUND(blankets_kg * %s, 2),
+            white_cost = ROUND(white_clothes_pieces * %s, 2),
+            pricing_version = 1
+        WHERE pricing_version IS NULL
+    ''', (rates['regular_clothes'], rates['blankets'], rates['white_clothes']))
+
+
+@migration(7, "index customer order history")
+def _add_customer_history_index(cursor):
+    # The order picker reads each matched customer's newest orders straight off this
+    # index; it starts with customer_name, so it also replaces the single-column index
+    if not _index_exists(cursor, 'orders', 'idx_orders_customer_created'):
+        cursor.execute('CREATE INDEX idx_orders_customer_created ON orders (customer_name, created_at)')
+    if _index_exists(cursor, 'orders', 'idx_orders_customer_name'):
+        if _dialect(cursor) == 'sqlite':
+            cursor.execute('DROP INDEX idx_orders_customer_name')
+        else:
+            cursor.execute('DROP INDEX idx_orders_customer_name ON orders')
+
+
+@migration(8, "index customer revenue")
+def _add_customer_revenue_index(cursor):
+    # Covers the top customers query, which then never reads the table rows
+    if not _index_exists(cursor, 'orders', 'idx_orders_customer_revenue'):
+        cursor.execute('CREATE INDEX idx_orders_customer_revenue ON orders (customer_name, total_amount)')
+
+
+def _ensure_version_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def current_version(conn):
+    """Return the highest applied schema version (0 for a new database)"""
+    cursor = conn.cursor()
+    _ensure_version_table(cursor)
+    cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version')
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return int(version)
+
+
+def pending_migrations(conn):
+    """Return the migrations this database has not applied yet"""
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def migrate(conn):
+    """Apply every pending migration in order; returns the applied versions.
+
+    On MySQL a named lock serializes concurrent runners and each migration
+    commits on its own. SQLite has no named locks, so the whole run is one
+    BEGIN IMMEDIATE transaction: its write lock keeps the other apps and
+    scripts on the same file waiting, and a failed run changes nothing.
+    """
+    cursor = conn.cursor()
+    sqlite = _dialect(cursor) == 'sqlite'
+    if sqlite:
+        cursor.execute(f'PRAGMA busy_timeout = {LOCK_TIMEOUT * 1000}')
+        cursor.execute('BEGIN IMMEDIATE')
+    else:
+        cursor.execute('SELECT GET_LOCK(%s, %s)', (LOCK_NAME, LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            cursor.close()
+            raise mysql.connector.errors.DatabaseError(
+                msg=f"Timed out waiting for migration lock '{LOCK_NAME}'"
+            )
+
+    applied = []
+    try:
+        for version, description, func in pending_migrations(conn):
+            func(cursor)
+            cursor.execute('INSERT INTO schema_version (version, description) VALUES (%s, %s)',
+                           (version, description))
+            if not sqlite:
+                conn.commit()
+            applied.append(version)
+        if sqlite:
+            conn.commit()
+    except Exception:
+        if sqlite:
+            conn.rollback()
+        raise
+    finally:
+        if sqlite:
+            cursor.execute(f'PRAGMA busy_timeout = {sqlite_db.BUSY_TIMEOUT * 1000}')
+        else:
+            cursor.execute('SELECT RELEASE_LOCK(%s)', (LOCK_NAME,))
+            cursor.fetchone()
+        cursor.close()
+    return applied
+
+def main():
+    """Apply pending migrations from the command line"""
+    print("🧺 Express Wash - Schema Migrations")
+    print("=" * 50)
+
+    try:
+        with storage.open_database().connection() as conn:
+            before = current_version(conn)
+            applied = migrate(conn)
+    except storage.DatabaseError as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+
+    for version, description, _ in MIGRATIONS:
+        if version in applied:
+            print(f"✅ Applied {version:03d}: {description}")
+    print(f"📋 Schema version: {before} → {max(applied, default=before)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,25 @@
 """
 MySQL Setup Script for Express Wash Laundry Billing System
 This script initializes the MySQL database and creates the required tables.
+With EXPRESS_WASH_DB_BACKEND=sqlite it sets up the embedded SQLite database
+(EXPRESS_WASH_SQLITE_PATH, default express_wash.db) instead.
 """
 
 import mysql.connector
 from mysql.connector import Error
 import sys
+import rollup
+import migrations
+import pricing
+import storage
 
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '16021995',
-    'database': 'express_wash'
-}
+# Database configuration (see storage.settings_from_env)
+SETTINGS = storage.settings_from_env()
+DB_CONFIG = SETTINGS['mysql_config']
+
+def get_database():
+    """Return the configured database"""
+    return storage.get_database(**SETTINGS)
 
 def test_connection():
     """Test MySQL connection"""
@@ -51,98 +57,114 @@ def create_database():
         print(f"❌ Error creating database: {e}")
         return False
 
+def describe_orders(cursor, dialect):
+    """Return (column, type, null, key, default) rows for the orders table"""
+    if dialect == 'sqlite':
+        cursor.execute("PRAGMA table_info(orders)")
+        return [(name, col_type, 'NO' if notnull else 'YES', 'PRI' if pk else '', default)
+                for _, name, col_type, notnull, default, pk in cursor.fetchall()]
+    cursor.execute("DESCRIBE orders")
+    return cursor.fetchall()
+
 def create_tables():
-    """Create the orders table"""
+    """Create or upgrade the tables by applying schema migrations"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        # Create orders table
-        create_table_query = '''
-            CREATE TABLE IF NOT EXISTS orders (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                customer_name VARCHAR(255) NOT NULL,
-                mobile_number VARCHAR(20),
-                order_date DATE NOT NULL,
-                regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                blankets_kg DECIMAL(5,2) DEFAULT 0,
-                white_clothes_pieces INT DEFAULT 0,
-                total_amount DECIMAL(10,2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        '''
-        
-        cursor.execute(create_table_query)
-        print("✅ Orders table created/verified successfully!")
+        db = get_database()
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Apply pending migrations
+            applied = migrations.migrate(conn)
+            for version, description, _ in migrations.MIGRATIONS:
+                if version in applied:
+                    print(f"✅ Applied migration {version:03d}: {description}")
+            print(f"✅ Schema is at version {migrations.current_version(conn)}")
+            
+            # Show table structure
+            print("\n📋 Table Structure:")
+            print("-" * 80)
+            for row in describe_orders(cursor, storage.dialect(db)):
+                print(f"{str(row[0]):<20} {str(row[1]):<20} {str(row[2]):<10} {str(row[3]):<10} {str(row[4]):<10}")
+            cursor.close()
         
-        # Show table structure
-        cursor.execute("DESCRIBE orders")
-        print("\n📋 Table Structure:")
-        print("-" * 80)
-        for row in cursor.fetchall():
-            print(f"{str(row[0]):<20} {str(row[1]):<20} {str(row[2]):<10} {str(row[3]):<10} {str(row[4]):<10}")
-        
-        conn.close()
         return True
-    except Error as e:
+    except storage.DatabaseError as e:
         print(f"❌ Error creating table: {e}")
         return False
 
 def insert_sample_data():
     """Insert sample data for testing"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
+        db = get_database()
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Sample data
+            sample_orders = [
+                ("Rahul Sharma", "9876543210", "2024-01-15", 2.5, 0.0, 3, 245.00),
+                ("Priya Patel", "8765432109", "2024-01-16", 1.0, 1.5, 0, 200.00),
+                ("Amit Kumar", "7654321098", "2024-01-17", 3.0, 0.0, 5, 350.00),
+                ("Neha Singh", "6543210987", "2024-01-18", 0.0, 2.0, 2, 280.00),
+                ("Rajesh Verma", "5432109876", "2024-01-19", 1.5, 0.5, 1, 165.00)
+            ]
         
-        # Sample data
-        sample_orders = [
-            ("Rahul Sharma", "9876543210", "2024-01-15", 2.5, 0.0, 3, 225.00),
-            ("Priya Patel", "8765432109", "2024-01-16", 1.0, 1.5, 0, 200.00),
-            ("Amit Kumar", "7654321098", "2024-01-17", 3.0, 0.0, 5, 350.00),
-            ("Neha Singh", "6543210987", "2024-01-18", 0.0, 2.0, 2, 280.00),
-            ("Rajesh Verma", "5432109876", "2024-01-19", 1.5, 0.5, 1, 135.00)
-        ]
+            insert_query = '''
+                INSERT INTO orders (customer_name, mobile_number, order_date, 
+                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount,
+                                   regular_cost, blankets_cost, white_cost, pricing_version)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            '''
+            
+            # Per-service amounts at the current price list
+            rows = []
+            for order in sample_orders:
+                amounts = pricing.line_amounts(dict(zip(
+                    ['regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces'], order[3:6])))
+                rows.append(order + (amounts['regular_cost'], amounts['blankets_cost'],
+                                     amounts['white_cost'], amounts['pricing_version']))
         
-        insert_query = '''
-            INSERT INTO orders (customer_name, mobile_number, order_date, 
-                               regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        '''
+            cursor.executemany(insert_query, rows)
+            conn.commit()
+            rollup.rebuild(conn)
         
-        cursor.executemany(insert_query, sample_orders)
-        conn.commit()
+            print(f"✅ Inserted {len(sample_orders)} sample orders successfully!")
         
-        print(f"✅ Inserted {len(sample_orders)} sample orders successfully!")
+            # Show sample data
+            cursor.execute('''
+                SELECT id, customer_name, mobile_number, order_date, regular_clothes_kg,
+                       blankets_kg, white_clothes_pieces, total_amount
+                FROM orders ORDER BY created_at DESC LIMIT 5
+            ''')
+            print("\n📊 Sample Data:")
+            print("-" * 80)
+            for row in cursor.fetchall():
+                print(f"ID: {row[0]}, Customer: {row[1]}, Amount: ₹{row[7]}, Date: {row[3]}")
         
-        # Show sample data
-        cursor.execute("SELECT * FROM orders ORDER BY created_at DESC LIMIT 5")
-        print("\n📊 Sample Data:")
-        print("-" * 80)
-        for row in cursor.fetchall():
-            print(f"ID: {row[0]}, Customer: {row[1]}, Amount: ₹{row[7]}, Date: {row[3]}")
-        
-        conn.close()
-        return True
-    except Error as e:
+            cursor.close()
+            return True
+    except storage.DatabaseError as e:
         print(f"❌ Error inserting sample data: {e}")
         return False
 
 def main():
     """Main setup function"""
-    print("🧺 Express Wash - MySQL Database Setup")
+    print("🧺 Express Wash - Database Setup")
     print("=" * 50)
     
-    # Test connection
-    if not test_connection():
-        print("\n🔧 Troubleshooting:")
-        print("1. Make sure MySQL server is running")
-        print("2. Verify username and password")
-        print("3. Check if MySQL is accessible on localhost")
-        sys.exit(1)
-    
-    # Create database
-    if not create_database():
-        sys.exit(1)
+    if storage.dialect(get_database()) == 'mysql':
+        # Test connection
+        if not test_connection():
+            print("\n🔧 Troubleshooting:")
+            print("1. Make sure MySQL server is running")
+            print("2. Verify username and password")
+            print("3. Check if MySQL is accessible on localhost")
+            sys.exit(1)
+        
+        # Create database
+        if not create_database():
+            sys.exit(1)
+    else:
+        print(f"📁 Using {storage.describe(get_database())}")
     
     # Create tables
     if not create_tables():
@@ -153,10 +175,10 @@ def main():
     if choice in ['y', 'yes']:
         insert_sample_data()
     
-    print("\n🎉 MySQL setup completed successfully!")
+    print("\n🎉 Database setup completed successfully!")
     print("\n🚀 You can now run the Express Wash application:")
     print("   streamlit run app.py")
-    print("\n📖 The application will use MySQL database instead of SQLite.")
+    print(f"\n📖 The application will use {storage.describe(get_database())}.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
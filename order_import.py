@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Bulk Order Import for Express Wash Laundry Billing System
+Streams orders from CSV or Excel files in chunks, validates them, recomputes
+every total with the current price list and writes each chunk in one
+transaction with a batched insert (or LOAD DATA LOCAL INFILE when the server
+allows it). Rejected rows are reported with the reason instead of stopping the
+import.
+
+Usage: python order_import.py FILE [--chunk-size N] [--monthfirst] [--load-data]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from mysql.connector import Error
+import pandas as pd
+
+import csv_backup
+import pricing
+import receipts
+import rollup
+import storage
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_DAYFIRST = True   # registers write dates as 30/07/2025
+
+REQUIRED_COLUMNS = ['customer_name', 'order_date']
+QUANTITY_COLUMNS = ['regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces']
+
+# Header spellings seen in the paper-register spreadsheets, after normalizing
+# to lowercase words joined by underscores
+COLUMN_ALIASES = {
+    'customer_name': ['customer_name', 'customer', 'name'],
+    'mobile_number': ['mobile_number', 'mobile', 'mobile_no', 'phone', 'phone_number', 'contact'],
+    'order_date': ['order_date', 'date'],
+    'regular_clothes_kg': ['regular_clothes_kg', 'regular_kg', 'regular', 'regular_clothes'],
+    'blankets_kg': ['blankets_kg', 'blankets', 'blanket_kg'],
+    'white_clothes_pieces': ['white_clothes_pieces', 'white_pieces', 'white', 'white_clothes'],
+    'total_amount': ['total_amount', 'total', 'amount'],
+}
+
+INSERT_COLUMNS = ['receipt_number', 'customer_name', 'mobile_number', 'order_date',
+                  'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount',
+                  'regular_cost', 'blankets_cost', 'white_cost', 'pricing_version']
+INSERT_SQL = f'''
+    INSERT INTO orders ({", ".join(INSERT_COLUMNS)})
+    VALUES ({", ".join(["%s"] * len(INSERT_COLUMNS))})
+'''
+
+
+def _normalize_header(name):
+    return '_'.join(''.join(ch if ch.isalnum() else ' ' for ch in str(name).lower()).split())
+
+
+def map_columns(headers):
+    """Return {file header: order column} for the headers we recognise"""
+    lookup = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for header in headers:
+        column = lookup.get(_normalize_header(header))
+        if column and column not in mapping.values():
+            mapping[header] = column
+    missing = [c for c in REQUIRED_COLUMNS if c not in mapping.values()]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+    return mapping
+
+
+def _file_name(source):
+    return getattr(source, 'name', None) or str(source)
+
+
+def read_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of raw text values from a CSV or XLSX path or upload"""
+    if _file_name(source).lower().endswith(('.xlsx', '.xlsm')):
+        yield from _read_excel_chunks(source, chunk_size)
+    else:
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False,
+                               skipinitialspace=True, chunksize=chunk_size)
+
+
+def _read_excel_chunks(source, chunk_size):
+    from openpyxl import load_workbook
+
+    # read_only streams rows instead of loading the whole sheet
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [str(h) if h is not None else '' for h in next(rows, [])]
+        width = len(headers)
+        batch = []
+        for row in rows:
+            if not any(value not in (None, '') for value in row):
+                continue
+            values = ['' if value is None else value for value in row[:width]]
+            batch.append(values + [''] * (width - len(values)))
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=headers)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=headers)
+    finally:
+        workbook.close()
+
+
+def validate_chunk(raw, mapping, first_row, dayfirst=DEFAULT_DAYFIRST):
+    """Clean one chunk; returns (orders DataFrame, rejected rows, repriced count).
+
+    first_row is the spreadsheet row number of the chunk's first data row, so
+    rejections can be found in the original file.
+    """
+    df = raw[list(mapping)].rename(columns=mapping)
+    df.index = range(first_row, first_row + len(df))
+    reasons = pd.Series('', index=df.index)
+
+    def reject(mask, reason):
+        reasons[mask & (reasons == '')] = reason
+
+    def text(column):
+        if column not in df:
+            return pd.Series('', index=df.index)
+        return df[column].astype(str).str.split().str.join(' ').fillna('')
+
+    orders = pd.DataFrame(index=df.index)
+    orders['customer_name'] = text('customer_name')
+    reject(orders['customer_name'] == '', 'missing customer name')
+
+    mobile = text('mobile_number').str.replace(r'[\s\-()+]', '', regex=True)
+    mobile = mobile.str.replace(r'\.0$', '', regex=True)   # Excel stores numbers as floats
+    reject(~mobile.str.fullmatch(r'\d{0,20}'), 'invalid mobile number')
+    orders['mobile_number'] = mobile.where(mobile != '', None)
+
+    # Registers mix date styles, so parse each value on its own; ISO dates are
+    # parsed apart because dayfirst would swap their month and day
+    raw_dates = df['order_date'].astype(str).str.strip()
+    iso = raw_dates.str.match(r'\d{4}-\d{1,2}-\d{1,2}')
+    dates = pd.to_datetime(df['order_date'].where(~iso), errors='coerce', format='mixed', dayfirst=dayfirst)
+    dates[iso] = pd.to_datetime(raw_dates[iso].str[:10], errors='coerce', format='%Y-%m-%d')
+    reject(dates.isna(), 'invalid order date')
+    orders['order_date'] = dates.dt.date
+
+    for column in QUANTITY_COLUMNS:
+        raw_values = text(column)
+        values = pd.to_numeric(raw_values, errors='coerce')
+        reject(values.isna() & (raw_values != ''), f'{column} is not a number')
+        reject(values < 0, f'{column} is negative')
+        orders[column] = values.fillna(0)
+    reject(orders['white_clothes_pieces'] % 1 != 0, 'white_clothes_pieces is not a whole number')
+    reject(orders['regular_clothes_kg'].ge(1000) | orders['blankets_kg'].ge(1000), 'weight out of range')
+    reject(orders[QUANTITY_COLUMNS].sum(axis=1) == 0, 'no items')
+    orders['white_clothes_pieces'] = orders['white_clothes_pieces'].astype(int)
+
+    bad = reasons != ''
+
+    # Totals always follow the current price list; count the ones that disagree
+    bill = pricing.price_orders(orders)
+    orders['total_amount'] = bill['total']
+    for column in pricing.COST_COLUMNS:
+        orders[column] = bill[column].round(2)
+    orders['pricing_version'] = pricing.PRICING_VERSION
+    repriced = 0
+    if 'total_amount' in df:
+        given = pd.to_numeric(text('total_amount'), errors='coerce')
+        repriced = int(((given - orders['total_amount']).abs() > 0.005)[~bad].sum())
+
+    rejected = [
+        dict(raw.iloc[i].astype(str).to_dict(), row=row_number, reason=reasons[row_number])
+        for i, row_number in enumerate(df.index) if bad[row_number]
+    ]
+    return orders[~bad], rejected, repriced
+
+
+def _assign_receipts(cursor, orders):
+    """Reserve one block of receipt numbers per order date in the chunk"""
+    numbers = pd.Series('', index=orders.index)
+    for day, group in orders.groupby('order_date'):
+        first = receipts.reserve(cursor, day, len(group))
+        numbers[group.index] = [receipts.format_receipt_number(day, first + i)
+                                for i in range(len(group))]
+    return numbers
+
+
+def _plain_rows(df):
+    """Rows as tuples of plain Python values (None for missing) the connector can convert"""
+    columns = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns]
+    return list(zip(*columns))
+
+
+def _load_data(cursor, orders):
+    """Bulk load through LOAD DATA LOCAL INFILE (needs allow_local_infile)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8',
+                                     delete=False) as f:
+        orders[INSERT_COLUMNS].to_csv(f, index=False, header=False, na_rep='\\N',
+                                      quoting=csv.QUOTE_MINIMAL)
+        path = f.name
+    try:
+        cursor.execute(f'''
+            LOAD DATA LOCAL INFILE %s INTO TABLE orders
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+            LINES TERMINATED BY '\\n'
+            ({", ".join(INSERT_COLUMNS)})
+        ''', (path.replace(os.sep, '/'),))
+    finally:
+        os.remove(path)
+
+
+def write_chunk(conn, orders, use_load_data=False):
+    """Insert one validated chunk in a single transaction; returns [(id, order_data)]"""
+    cursor = conn.cursor()
+    try:
+        orders = orders.assign(receipt_number=_assign_receipts(cursor, orders))
+        if use_load_data:
+            _load_data(cursor, orders)
+        else:
+            cursor.executemany(INSERT_SQL, _plain_rows(orders[INSERT_COLUMNS]))
+        rollup.record_inserts(cursor, orders)
+
+        # Ids for the CSV backup, looked up by the receipt numbers just issued
+        numbers = orders['receipt_number'].tolist()
+        placeholders = ', '.join(['%s'] * len(numbers))
+        cursor.execute(f'SELECT receipt_number, id FROM orders WHERE receipt_number IN ({placeholders})',
+                       numbers)
+        ids = dict(cursor.fetchall())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    records = orders.to_dict('records')
+    return [(ids.get(record['receipt_number'], ''), record) for record in records]
+
+
+def import_orders(conn, source, chunk_size=DEFAULT_CHUNK_SIZE, dayfirst=DEFAULT_DAYFIRST,
+                  use_load_data=False, progress=None):
+    """Import a CSV/XLSX file of orders; returns a summary dict.
+
+    progress, if given, is called with the running summary after each chunk.
+    """
+    summary = {'rows_read': 0, 'imported': 0, 'rejected': [], 'repriced': 0,
+               'seconds': 0.0, 'rows_per_second': 0.0, 'method': 'executemany'}
+    started = time.perf_counter()
+    mapping = None
+    # LOAD DATA LOCAL INFILE only exists on MySQL
+    use_load_data = use_load_data and getattr(conn, 'dialect', 'mysql') == 'mysql'
+
+    for raw in read_chunks(source, chunk_size):
+        if mapping is None:
+            mapping = map_columns(raw.columns)
+        # Row numbers as a spreadsheet shows them: header is row 1
+        first_row = summary['rows_read'] + 2
+        summary['rows_read'] += len(raw)
+
+        orders, rejected, repriced = validate_chunk(raw, mapping, first_row, dayfirst)
+        summary['rejected'].extend(rejected)
+        summary['repriced'] += repriced
+
+        if not orders.empty:
+            try:
+                saved = write_chunk(conn, orders, use_load_data)
+            except Error as e:
+                if not use_load_data:
+                    raise
+                # Server or connection does not allow LOCAL INFILE; batch instead
+                print(f"⚠️ LOAD DATA unavailable ({e.msg}), using batched inserts")
+                use_load_data = False
+                saved = write_chunk(conn, orders, use_load_data)
+            summary['method'] = 'load_data' if use_load_data else 'executemany'
+            summary['imported'] += len(saved)
+            csv_backup.append_orders(saved)
+
+        summary['seconds'] = time.perf_counter() - started
+        summary['rows_per_second'] = summary['rows_read'] / summary['seconds'] if summary['seconds'] else 0.0
+        if progress is not None:
+            progress(summary)
+
+    if mapping is None:
+        raise ValueError("The file has no rows")
+    return summary
+
+
+def write_rejects(rejected, path):
+    """Save rejected rows with their reasons so they can be fixed and re-imported"""
+    columns = ['row', 'reason'] + [c for c in rejected[0] if c not in ('row', 'reason')]
+    pd.DataFrame(rejected, columns=columns).to_csv(path, index=False)
+
+
+def main():
+    """Import orders from the command line"""
+    args = sys.argv[1:]
+    if not args or args[0].startswith('-'):
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    path = args[0]
+    chunk_size = int(args[args.index('--chunk-size') + 1]) if '--chunk-size' in args else DEFAULT_CHUNK_SIZE
+    use_load_data = '--load-data' in args
+    dayfirst = DEFAULT_DAYFIRST and '--monthfirst' not in args
+
+    print("🧺 Express Wash - Bulk Order Import")
+    print("=" * 50)
+
+    def report(summary):
+        print(f"⏳ {summary['rows_read']:,} rows read, {summary['imported']:,} imported "
+              f"({summary['rows_per_second']:,.0f} rows/s)")
+
+    try:
+        settings = storage.settings_from_env()
+        if use_load_data:
+            settings['mysql_config']['allow_local_infile'] = True
+        with storage.get_database(**settings).connection() as conn:
+            summary = import_orders(conn, path, chunk_size, dayfirst=dayfirst,
+                                    use_load_data=use_load_data, progress=report)
+    except (*storage.DatabaseError, ValueError, OSError) as e:
+        print(f"❌ Import failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ Imported {summary['imported']:,} of {summary['rows_read']:,} rows in "
+          f"{summary['seconds']:.1f}s ({summary['rows_per_second']:,.0f} rows/s, {summary['method']})")
+    if summary['repriced']:
+        print(f"💰 {summary['repriced']:,} totals differed from the current price list and were recomputed")
+    if summary['rejected']:
+        rejects_path = os.path.splitext(path)[0] + '_rejected.csv'
+        write_rejects(summary['rejected'], rejects_path)
+        print(f"⚠️ {len(summary['rejected']):,} rows rejected, see {rejects_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Order Queries for Express Wash Laundry Billing System
+Builds the parameterized SQL behind the View Orders table so filtering and
+paging happen in the database instead of in pandas. Pages come back with the
+schema dtypes from order_frame, ready to display without reformatting.
+"""
+
+import order_frame
+import receipts
+
+ORDER_COLUMNS = [
+    'id', 'customer_name', 'mobile_number', 'order_date', 'regular_clothes_kg',
+    'blankets_kg', 'white_clothes_pieces', 'total_amount', 'created_at'
+]
+
+DEFAULT_PAGE_SIZE = 50
+
+# Columns and size of the Edit/Delete order picker's match list
+PICKER_COLUMNS = ['id', 'receipt_number', 'customer_name', 'mobile_number', 'order_date', 'total_amount',
+                  'created_at']
+PICKER_LIMIT = 20
+PICKER_CUSTOMERS = 10   # customers taken from the fuzzy lookup for a name search
+
+def _escape_like(term):
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_filters(search_name=None, order_date=None, min_amount=None):
+    """Return (where_sql, params) for the View Orders filters"""
+    clauses = []
+    params = []
+
+    words = search_name.split() if search_name else []
+    if words:
+        # Stray or doubled spaces in stored names should not hide a match
+        clauses.append("customer_name LIKE %s")
+        params.append("%" + "%".join(_escape_like(word) for word in words) + "%")
+
+    if order_date:
+        clauses.append("order_date = %s")
+        params.append(order_date.strftime('%Y-%m-%d') if hasattr(order_date, 'strftime') else order_date)
+
+    if min_amount:
+        clauses.append("total_amount >= %s")
+        params.append(min_amount)
+
+    where_sql = " AND ".join(clauses) if clauses else "1 = 1"
+    return where_sql, params
+
+
+def _prefix_range(prefix):
+    """(low, high) bounds of the strings starting with prefix, for an index range scan.
+
+    Receipt and mobile numbers are digits, capitals and hyphens; LIKE 'x%'
+    cannot use a plain index on SQLite, a range can.
+    """
+    # Digits sort before capitals in both engines' collations, so 9 is followed by A
+    stem = prefix.rstrip('-Z')
+    if not stem:
+        return None
+    last = stem[-1]
+    return prefix, stem[:-1] + ('A' if last == '9' else chr(ord(last) + 1))
+
+
+def build_order_search(term, customer_names=()):
+    """Return a list of (where_sql, params, order_sql), one per way term can match an order.
+
+    Each one is an equality or range on an indexed column: receipt number and
+    phone prefixes, an exact id, and the exact customer names a fuzzy lookup
+    found for term. Prefix ranges are read in their own index order, so even a
+    one-character prefix stops after the first rows instead of sorting them all.
+    """
+    words = term.split() if term else []
+    if not words:
+        return []
+
+    searches = []
+    receipt_range = _prefix_range("".join(words).upper())
+    if receipt_range:
+        # Receipt numbers embed the date, so descending is newest first
+        searches.append(("receipt_number >= %s AND receipt_number < %s", list(receipt_range),
+                         "receipt_number DESC"))
+
+    for name in customer_names:
+        # One lookup per name keeps each read on the (customer_name, created_at) index
+        searches.append(("customer_name = %s", [name], "created_at DESC, id DESC"))
+
+    digits = "".join(words)
+    if digits.isdigit():
+        searches.append(("mobile_number >= %s AND mobile_number < %s", list(_prefix_range(digits)),
+                         "mobile_number DESC"))
+        if len(digits) <= 9:
+            searches.append(("id = %s", [int(digits)], "id"))
+
+    return searches
+
+
+def _select(conn, query, params):
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    columns = [d[0] for d in cursor.description]
+    cursor.close()
+    return rows, columns
+
+
+def has_orders(conn):
+    """Return True if at least one order exists"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM orders LIMIT 1")
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def count_orders(conn, filters):
+    """Count the orders matching the filters"""
+    where_sql, params = filters
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM orders WHERE {where_sql}", params)
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return int(total)
+
+
+def fetch_orders_page(conn, filters, page_size=DEFAULT_PAGE_SIZE, after=None):
+    """Fetch one page of matching orders, newest first.
+
+    ``after`` is the (created_at, id) of the last row on the previous page;
+    seeking past it keeps every page as cheap as the first one. Returns the
+    page and the cursor for the next page (None on the last page).
+    """
+    where_sql, params = filters
+    params = list(params)
+
+    if after is not None:
+        created_at, order_id = after
+        where_sql += " AND (created_at < %s OR (created_at = %s AND id < %s))"
+        params.extend([created_at, created_at, order_id])
+
+    # Ask for one extra row to learn whether another page follows
+    query = f'''
+        SELECT {", ".join(ORDER_COLUMNS)} FROM orders
+        WHERE {where_sql}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    '''
+    params.append(page_size + 1)
+    rows, columns = _select(conn, query, params)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = dict(zip(columns, rows[-1]))
+        next_cursor = (last['created_at'], last['id'])
+    return order_frame.from_rows(rows, columns), next_cursor
+
+
+def fetch_filtered_orders(conn, filters):
+    """Fetch every order matching the filters (used for downloads)"""
+    where_sql, params = filters
+    query = f'''
+        SELECT {", ".join(ORDER_COLUMNS)} FROM orders
+        WHERE {where_sql}
+        ORDER BY created_at DESC, id DESC
+    '''
+    rows, columns = _select(conn, query, params)
+    return order_frame.from_rows(rows, columns)
+
+
+def _picker_customer_names(term, customer_index):
+    """Stored spellings of the customers customer_index finds for a name search"""
+    if customer_index is None or not any(ch.isalpha() for ch in term):
+        return []
+    if term.upper().startswith(receipts.RECEIPT_PREFIX):
+        return []
+    return [name for customer, _ in customer_index.search(term, limit=PICKER_CUSTOMERS)
+            for name in customer['stored_names']]
+
+
+def search_orders(conn, term, limit=PICKER_LIMIT, customer_index=None):
+    """Up to limit orders matching term, newest first, for the Edit/Delete picker.
+
+    An order whose id or receipt number is exactly term is listed first. The
+    other matches, newest first, come from the indexed searches of
+    build_order_search, each stopped after limit rows, so a term that matches
+    little or nothing is as cheap as a common one. Names are matched through
+    customer_index (a customer_lookup.CustomerIndex), which also finds a word
+    in the middle of a name and misspellings.
+    """
+    select = f"SELECT {', '.join(PICKER_COLUMNS)} FROM orders"
+    term = " ".join((term or "").split())
+    if not term:
+        rows, _ = _select(conn, f"{select} ORDER BY created_at DESC, id DESC LIMIT %s", [limit])
+        return order_frame.from_rows(rows, PICKER_COLUMNS)
+
+    clauses, params = ["receipt_number = %s"], [term.upper()]
+    if term.isdigit() and len(term) <= 9:
+        clauses.append("id = %s")
+        params.append(int(term))
+    exact, _ = _select(conn, f"{select} WHERE {' OR '.join(clauses)}", params)
+
+    matches = []
+    for where_sql, params, order_sql in build_order_search(term, _picker_customer_names(term, customer_index)):
+        rows, _ = _select(conn, f"{select} WHERE {where_sql} ORDER BY {order_sql} LIMIT %s", params + [limit])
+        matches.extend(rows)
+    created_at = PICKER_COLUMNS.index('created_at')
+    matches.sort(key=lambda row: (row[created_at], row[0]), reverse=True)
+
+    # A typed phone prefix is often also an existing id, so both kinds are kept
+    rows, seen = list(exact), {row[0] for row in exact}
+    for row in matches:
+        if row[0] not in seen:
+            seen.add(row[0])
+            rows.append(row)
+    return order_frame.from_rows(rows[:limit], PICKER_COLUMNS)
@@ -0,0 +1,114 @@
+"""
+Pricing for Express Wash Laundry Billing System
+Service rates and bill calculation, shared by the apps and the bulk importer.
+Bulk pricing works on NumPy arrays of quantities and a price vector, so a whole
+order history can be re-quoted at new rates in one pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Every price list the shop has used, by version. Orders store the version they
+# were billed at, so add a new version for a price change instead of editing one.
+PRICE_LISTS = {
+    1: {
+        'regular_clothes': 50,  # ₹50/kg
+        'blankets': 100,        # ₹100/kg
+        'white_clothes': 40     # ₹40/piece
+    },
+}
+
+# Pricing configuration: the newest price list
+PRICING_VERSION = max(PRICE_LISTS)
+PRICING = PRICE_LISTS[PRICING_VERSION]
+
+# Service order of price vectors and quantity arrays
+SERVICES = ['regular_clothes', 'blankets', 'white_clothes']
+QUANTITY_COLUMNS = ['regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces']
+COST_COLUMNS = ['regular_cost', 'blankets_cost', 'white_cost']
+SERVICE_LABELS = ['Regular Clothes', 'Blankets/Bedsheets', 'White Clothes']
+
+
+def calculate_bill(regular_kg, blankets_kg, white_pieces):
+    """Calculate total bill based on services"""
+    regular_cost = regular_kg * PRICING['regular_clothes']
+    blankets_cost = blankets_kg * PRICING['blankets']
+    white_cost = white_pieces * PRICING['white_clothes']
+
+    total = regular_cost + blankets_cost + white_cost
+    return {
+        'regular_cost': regular_cost,
+        'blankets_cost': blankets_cost,
+        'white_cost': white_cost,
+        'total': total
+    }
+
+
+def line_amounts(order_data):
+    """Stored per-service amounts and price list version for one order"""
+    bill = calculate_bill(float(order_data['regular_clothes_kg']), float(order_data['blankets_kg']),
+                          int(order_data['white_clothes_pieces']))
+    amounts = {column: round(bill[column], 2) for column in COST_COLUMNS}
+    amounts['pricing_version'] = PRICING_VERSION
+    return amounts
+
+
+def price_vector(prices=None):
+    """Rates as an array in SERVICES order (default: the current PRICING)"""
+    prices = PRICING if prices is None else prices
+    return np.array([prices[service] for service in SERVICES], dtype=float)
+
+
+def quantity_array(df):
+    """Order quantities as an (n, 3) float array in SERVICES order"""
+    return df[QUANTITY_COLUMNS].to_numpy(dtype=float)
+
+
+def price_lines(quantities, prices):
+    """Per-line costs (n, 3) and rounded order totals (n,) for a quantity array"""
+    lines = quantities * prices
+    return lines, lines.sum(axis=1).round(2)
+
+
+def price_orders(df, prices=None):
+    """calculate_bill for a whole DataFrame of orders at once"""
+    lines, totals = price_lines(quantity_array(df), price_vector(prices))
+    bill = pd.DataFrame(lines, columns=COST_COLUMNS, index=df.index)
+    bill['total'] = totals
+    return bill
+
+
+def simulate(orders, new_prices, base_prices=None):
+    """Re-price orders at new rates and compare with the base (current) rates.
+
+    Returns order count, recorded/base/new revenue, a per-service table and a
+    per-month table of base and new revenue.
+    """
+    quantities = quantity_array(orders)
+    base_lines, base_totals = price_lines(quantities, price_vector(base_prices))
+    new_lines, new_totals = price_lines(quantities, price_vector(new_prices))
+
+    services = pd.DataFrame({
+        'service': SERVICE_LABELS,
+        'current': base_lines.sum(axis=0),
+        'new': new_lines.sum(axis=0),
+    })
+    services['change'] = services['new'] - services['current']
+
+    # Month number since year 0, bucketed with bincount instead of a groupby
+    dates = pd.to_datetime(orders['order_date'])
+    months, index = np.unique((dates.dt.year * 12 + dates.dt.month - 1).to_numpy(), return_inverse=True)
+    monthly = pd.DataFrame({
+        'month': [f"{m // 12}-{m % 12 + 1:02d}" for m in months],
+        'current': np.bincount(index, weights=base_totals, minlength=len(months)),
+        'new': np.bincount(index, weights=new_totals, minlength=len(months)),
+    })
+
+    return {
+        'orders': len(orders),
+        'recorded': float(orders['total_amount'].astype(float).sum()),
+        'current': float(base_totals.sum()),
+        'new': float(new_totals.sum()),
+        'services': services,
+        'monthly': monthly,
+    }
@@ -0,0 +1,113 @@
+"""
+Receipt Numbers for Express Wash Laundry Billing System
+Issues RW-YYYYMMDD-NNNN receipt numbers from a per-day sequence table. A number
+is taken with a single atomic upsert inside the caller's insert transaction, so
+two counters saving at the same moment can never get the same number. Terminals
+can instead reserve a block of numbers up front and hand them out locally.
+"""
+
+import threading
+from datetime import date
+
+RECEIPT_PREFIX = 'RW'
+
+CREATE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS receipt_sequences (
+        seq_date DATE PRIMARY KEY,
+        last_value INT NOT NULL
+    )
+'''
+
+# Continue numbering from receipts issued before the sequence table existed
+SEED_SQL = '''
+    INSERT INTO receipt_sequences (seq_date, last_value)
+    SELECT STR_TO_DATE(SUBSTRING(receipt_number, 4, 8), '%Y%m%d') AS seq_date,
+           MAX(CAST(SUBSTRING_INDEX(receipt_number, '-', -1) AS UNSIGNED))
+    FROM orders
+    WHERE receipt_number LIKE 'RW-________-%'
+    GROUP BY seq_date
+    ON DUPLICATE KEY UPDATE last_value = GREATEST(last_value, VALUES(last_value))
+'''
+
+
+def format_receipt_number(day, sequence):
+    """Format a receipt number such as RW-20250730-0001"""
+    return f"{RECEIPT_PREFIX}-{day.strftime('%Y%m%d')}-{sequence:04d}"
+
+
+def reserve(cursor, day, count=1):
+    """Atomically reserve `count` sequence values for a day; returns the first.
+
+    The row stays locked until the caller's transaction ends, which is what
+    makes a same-transaction allocation safe.
+    """
+    cursor.execute('''
+        INSERT INTO receipt_sequences (seq_date, last_value)
+        VALUES (%s, LAST_INSERT_ID(%s))
+        ON DUPLICATE KEY UPDATE last_value = LAST_INSERT_ID(last_value + %s)
+    ''', (day, count, count))
+    cursor.execute('SELECT LAST_INSERT_ID()')
+    last_value = int(cursor.fetchone()[0])
+    return last_value - count + 1
+
+
+class ReceiptAllocator:
+    """Hands out receipt numbers, optionally from pre-reserved blocks.
+
+    With block_size 1 every number is reserved inside the order's own
+    transaction (next_receipt_number). Larger blocks are reserved in a short
+    transaction of their own and then issued from memory (reserved_number);
+    numbers left over when the terminal closes are simply skipped.
+    """
+
+    def __init__(self, pool=None, block_size=1):
+        if block_size > 1 and pool is None:
+            raise ValueError("Block pre-allocation needs a connection pool")
+        self.pool = pool
+        self.block_size = block_size
+        self._block = None   # (day, next_value, last_value)
+        self._lock = threading.Lock()
+
+    def reserved_number(self, day=None):
+        """Next number from this terminal's block, or None with block_size 1.
+
+        Refilling the block checks out a pooled connection of its own, so call
+        this before checking out the connection the order is saved on.
+        """
+        if self.block_size <= 1:
+            return None
+        day = day or date.today()
+
+        with self._lock:
+            if self._block is None or self._block[0] != day or self._block[1] > self._block[2]:
+                with self.pool.connection() as conn:
+                    block_cursor = conn.cursor()
+                    first = reserve(block_cursor, day, self.block_size)
+                    conn.commit()
+                    block_cursor.close()
+                self._block = (day, first, first + self.block_size - 1)
+
+            block_day, next_value, last_value = self._block
+            self._block = (block_day, next_value + 1, last_value)
+            return format_receipt_number(day, next_value)
+
+    def next_receipt_number(self, cursor, day=None):
+        """Reserve the next receipt number for day (default today) in cursor's transaction"""
+        day = day or date.today()
+        return format_receipt_number(day, reserve(cursor, day))
+
+
+# One allocator per terminal/process and configuration
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(pool, block_size=1):
+    """Return the process-wide allocator for this pool and block size"""
+    key = (id(pool), block_size)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = ReceiptAllocator(pool, block_size=block_size)
+            _allocators[key] = allocator
+        return allocator
@@ -0,0 +1,128 @@
+"""
+Order Repository for Express Wash Laundry Billing System
+The order writes and reads shared by the Streamlit app, the desktop app and the
+setup scripts. Each write issues its receipt number and adjusts the daily
+summary rollup in the same transaction, on whichever database storage.py chose.
+"""
+
+import order_frame
+import pricing
+import receipts
+import rollup
+from order_queries import ORDER_COLUMNS   # get_order's tuple positions
+
+INSERT_SQL = '''
+    INSERT INTO orders (receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg,
+                       blankets_kg, white_clothes_pieces, total_amount,
+                       regular_cost, blankets_cost, white_cost, pricing_version)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+# An edited order is re-billed at the current price list
+UPDATE_SQL = '''
+    UPDATE orders
+    SET customer_name = %s, mobile_number = %s, order_date = %s,
+        regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
+        total_amount = %s, regular_cost = %s, blankets_cost = %s, white_cost = %s,
+        pricing_version = %s
+    WHERE id = %s
+'''
+
+
+class OrderRepository:
+    """Order data access on a ConnectionPool or SQLiteDatabase"""
+
+    def __init__(self, db, receipt_block_size=1):
+        self.db = db
+        self.allocator = receipts.get_allocator(db, receipt_block_size)
+
+    def save_order(self, order_data):
+        """Insert an order and return its id; the receipt number is stored in order_data"""
+        # Taken from the terminal's block before the order's connection is checked out
+        receipt_number = self.allocator.reserved_number()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            order_data['receipt_number'] = receipt_number or self.allocator.next_receipt_number(cursor)
+            amounts = pricing.line_amounts(order_data)
+            cursor.execute(INSERT_SQL, (
+                order_data['receipt_number'],
+                order_data['customer_name'],
+                order_data['mobile_number'],
+                order_data['order_date'],
+                order_data['regular_clothes_kg'],
+                order_data['blankets_kg'],
+                order_data['white_clothes_pieces'],
+                order_data['total_amount'],
+                amounts['regular_cost'],
+                amounts['blankets_cost'],
+                amounts['white_cost'],
+                amounts['pricing_version']
+            ))
+            order_id = cursor.lastrowid
+            rollup.record_insert(cursor, order_data)
+            conn.commit()
+            cursor.close()
+        return order_id
+
+    def update_order(self, order_id, order_data):
+        """Replace an order's details; returns False if it no longer exists"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            old_order = rollup.fetch_order(cursor, order_id)
+            if old_order is None:
+                return False
+            amounts = pricing.line_amounts(order_data)
+            cursor.execute(UPDATE_SQL, (
+                order_data['customer_name'],
+                order_data['mobile_number'],
+                order_data['order_date'],
+                order_data['regular_clothes_kg'],
+                order_data['blankets_kg'],
+                order_data['white_clothes_pieces'],
+                order_data['total_amount'],
+                amounts['regular_cost'],
+                amounts['blankets_cost'],
+                amounts['white_cost'],
+                amounts['pricing_version'],
+                order_id
+            ))
+            rollup.record_update(cursor, old_order, order_data)
+            conn.commit()
+            cursor.close()
+        return True
+
+    def delete_order(self, order_id):
+        """Delete an order; returns False if it no longer exists"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            old_order = rollup.fetch_order(cursor, order_id)
+            if old_order is None:
+                return False
+            cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
+            rollup.record_delete(cursor, old_order)
+            conn.commit()
+            cursor.close()
+        return True
+
+    def get_order(self, order_id):
+        """One order as a tuple in ORDER_COLUMNS order, or None"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders WHERE id = %s", (order_id,))
+            row = cursor.fetchone()
+            cursor.close()
+        return row
+
+    def load_orders(self, paise=False):
+        """Every order, newest first, as a DataFrame with the schema dtypes (see order_frame)"""
+        with self.db.connection() as conn:
+            return order_frame.load_orders(conn, paise=paise)
+
+    def clear(self):
+        """Delete every order and empty the daily summary"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM orders')
+            conn.commit()
+            cursor.close()
+            rollup.rebuild(conn)
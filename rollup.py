@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Daily Summary Rollup for Express Wash Laundry Billing System
+Maintains one row per order date with order count, revenue, kg per service and
+white-clothes pieces. The insert, update and delete paths adjust it inside the
+same transaction as the order change, so analytics never has to scan orders.
+Run this script with --rebuild to recompute it from the orders table.
+"""
+
+import sys
+
+import pandas as pd
+
+import storage
+
+CREATE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        summary_date DATE PRIMARY KEY,
+        order_count INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+        regular_clothes_kg DECIMAL(12,2) NOT NULL DEFAULT 0,
+        blankets_kg DECIMAL(12,2) NOT NULL DEFAULT 0,
+        white_clothes_pieces INT NOT NULL DEFAULT 0
+    )
+'''
+
+REBUILD_SQL = '''
+    INSERT INTO daily_summary (summary_date, order_count, revenue,
+                               regular_clothes_kg, blankets_kg, white_clothes_pieces)
+    SELECT order_date, COUNT(*), COALESCE(SUM(total_amount), 0),
+           COALESCE(SUM(regular_clothes_kg), 0), COALESCE(SUM(blankets_kg), 0),
+           COALESCE(SUM(white_clothes_pieces), 0)
+    FROM orders
+    GROUP BY order_date
+'''
+
+# Order columns the rollup depends on
+TRACKED_COLUMNS = ['order_date', 'regular_clothes_kg', 'blankets_kg',
+                   'white_clothes_pieces', 'total_amount']
+
+
+# Adds one day's delta to its summary row
+UPSERT_SQL = '''
+    INSERT INTO daily_summary (summary_date, order_count, revenue,
+                               regular_clothes_kg, blankets_kg, white_clothes_pieces)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        order_count = order_count + VALUES(order_count),
+        revenue = revenue + VALUES(revenue),
+        regular_clothes_kg = regular_clothes_kg + VALUES(regular_clothes_kg),
+        blankets_kg = blankets_kg + VALUES(blankets_kg),
+        white_clothes_pieces = white_clothes_pieces + VALUES(white_clothes_pieces)
+'''
+
+
+def _apply(cursor, order, sign):
+    """Add (sign=1) or subtract (sign=-1) one order from its day"""
+    cursor.execute(UPSERT_SQL, (
+        order['order_date'],
+        sign,
+        sign * float(order['total_amount']),
+        sign * float(order['regular_clothes_kg']),
+        sign * float(order['blankets_kg']),
+        sign * int(order['white_clothes_pieces'])
+    ))
+    if sign < 0:
+        cursor.execute('DELETE FROM daily_summary WHERE summary_date = %s AND order_count <= 0',
+                       (order['order_date'],))
+
+
+def fetch_order(cursor, order_id):
+    """Lock an order and return the values the rollup needs, or None"""
+    cursor.execute(f'''
+        SELECT {", ".join(TRACKED_COLUMNS)} FROM orders WHERE id = %s FOR UPDATE
+    ''', (order_id,))
+    row = cursor.fetchone()
+    return dict(zip(TRACKED_COLUMNS, row)) if row else None
+
+
+def record_insert(cursor, order_data):
+    """Account for a newly inserted order"""
+    _apply(cursor, order_data, 1)
+
+
+def record_inserts(cursor, orders):
+    """Account for a DataFrame of newly inserted orders, one upsert per day"""
+    if orders.empty:
+        return
+    days = orders.groupby('order_date').agg(
+        order_count=('total_amount', 'size'),
+        revenue=('total_amount', 'sum'),
+        regular_clothes_kg=('regular_clothes_kg', 'sum'),
+        blankets_kg=('blankets_kg', 'sum'),
+        white_clothes_pieces=('white_clothes_pieces', 'sum'),
+    )
+    cursor.executemany(UPSERT_SQL, [
+        (day, int(row.order_count), float(row.revenue), float(row.regular_clothes_kg),
+         float(row.blankets_kg), int(row.white_clothes_pieces))
+        for day, row in days.iterrows()
+    ])
+
+
+def record_update(cursor, old_order, order_data):
+    """Move an edited order's contribution from its old values to the new ones"""
+    if old_order is not None:
+        _apply(cursor, old_order, -1)
+    _apply(cursor, order_data, 1)
+
+
+def record_delete(cursor, old_order):
+    """Remove a deleted order's contribution"""
+    if old_order is not None:
+        _apply(cursor, old_order, -1)
+
+
+def rebuild(conn):
+    """Recompute the whole rollup from the orders table"""
+    cursor = conn.cursor()
+    cursor.execute(CREATE_TABLE_SQL)
+    cursor.execute('DELETE FROM daily_summary')
+    cursor.execute(REBUILD_SQL)
+    days = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return days
+
+
+def load_daily_summary(conn, start_date=None, end_date=None):
+    """Return the rollup as a DataFrame ordered by date"""
+    clauses = []
+    params = []
+    if start_date:
+        clauses.append('summary_date >= %s')
+        params.append(start_date)
+    if end_date:
+        clauses.append('summary_date <= %s')
+        params.append(end_date)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT summary_date, order_count, revenue, regular_clothes_kg,
+               blankets_kg, white_clothes_pieces
+        FROM daily_summary {where_sql}
+        ORDER BY summary_date
+    ''', params)
+    rows = cursor.fetchall()
+    columns = [d[0] for d in cursor.description]
+    cursor.close()
+
+    df = pd.DataFrame(rows, columns=columns)
+    for column in ['revenue', 'regular_clothes_kg', 'blankets_kg']:
+        df[column] = df[column].astype(float)
+    return df
+
+
+def main():
+    """Rebuild the rollup from the command line"""
+    print("🧺 Express Wash - Daily Summary Rollup")
+    print("=" * 50)
+
+    if '--rebuild' not in sys.argv[1:]:
+        print("Usage: python rollup.py --rebuild")
+        sys.exit(1)
+
+    try:
+        with storage.open_database().connection() as conn:
+            days = rebuild(conn)
+    except storage.DatabaseError as e:
+        print(f"❌ Error rebuilding daily summary: {e}")
+        sys.exit(1)
+
+    print(f"✅ Daily summary rebuilt for {days} days")
+
+
+if __name__ == "__main__":
+    main()
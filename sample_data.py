@@ -1,144 +1,280 @@
 """
 Sample Data Generator for Express Wash Laundry Billing System
 This script creates realistic sample data for testing the application.
+The same seed always produces the same orders, from a handful for a demo up to
+millions for performance work.
+
+Usage:
+    python sample_data.py                       # interactive menu
+    python sample_data.py --orders 1000000 --customers 50000 --days 730 --end-date 2025-06-30 --seed 7
 """
 
-import mysql.connector
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
-
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '16021995',
-    'database': 'express_wash'
-}
-
-def create_sample_data():
-    """Generate and insert sample data into the database"""
-    
-    # Connect to database
-    conn = mysql.connector.connect(**DB_CONFIG)
+
+import pricing
+import receipts
+import rollup
+import storage
+from repository import OrderRepository
+
+DEFAULT_SEED = 42
+BATCH_SIZE = 5000          # rows per multi-row INSERT and commit
+BLOCK_SIZE = 10000         # rows generated per random stream, independent of BATCH_SIZE
+
+# Customer names are drawn from these pools
+FIRST_NAMES = [
+    "Rahul", "Priya", "Amit", "Neha", "Rajesh", "Sita", "Mohan", "Anjali", "Vikram", "Pooja",
+    "Sanjay", "Kavita", "Deepak", "Sunita", "Arun", "Meera", "Suresh", "Lakshmi", "Ganesh", "Radha",
+    "Babita", "Akshay", "Snehal", "Nitin", "Swati", "Prakash", "Rekha", "Sachin", "Manisha", "Vijay"
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Kumar", "Singh", "Verma", "Devi", "Das", "Gupta", "Malhotra", "Reddy",
+    "Joshi", "Iyer", "Mehta", "Rao", "Khanna", "Nair", "Menon", "Pillai", "Krishnan", "Venkat",
+    "Bhujbal", "Pawar", "Deshmukh", "Kulkarni", "Jadhav"
+]
+
+# Probability that an order includes each service
+DEFAULT_SERVICE_MIX = {'regular_clothes': 0.85, 'blankets': 0.25, 'white_clothes': 0.40}
+
+# Relative order volume by month (winter blankets, festive season, monsoon dip)
+MONTH_FACTORS = {1: 1.15, 2: 1.0, 3: 0.95, 4: 0.9, 5: 0.9, 6: 0.8,
+                 7: 0.75, 8: 0.8, 9: 0.95, 10: 1.2, 11: 1.3, 12: 1.2}
+# Relative order volume by weekday (Monday = 0); weekends are busiest
+WEEKDAY_FACTORS = [0.9, 0.85, 0.85, 0.9, 1.0, 1.3, 1.4]
+
+
+def make_customers(count, seed=DEFAULT_SEED):
+    """Return a DataFrame of customer names and unique mobile numbers"""
+    rng = np.random.default_rng([seed, 0])
+    first = rng.integers(0, len(FIRST_NAMES), count)
+    last = rng.integers(0, len(LAST_NAMES), count)
+    names = [f"{FIRST_NAMES[first_index]} {LAST_NAMES[last_index]}"
+             for first_index, last_index in zip(first, last)]
+
+    # An affine map over the 10-digit range starting at 6 keeps numbers unique
+    span = 4_000_000_000
+    mobiles = 6_000_000_000 + (np.arange(count, dtype=np.int64) * 2_654_435_761 + seed) % span
+    return pd.DataFrame({'customer_name': names, 'mobile_number': mobiles.astype(str)})
+
+
+def day_weights(start_date, days, seasonality=1.0):
+    """Relative order volume for each day; seasonality 0 gives a flat distribution"""
+    dates = pd.date_range(start_date, periods=days, freq='D')
+    month = dates.month.map(MONTH_FACTORS).to_numpy(dtype=float)
+    weekday = np.array(WEEKDAY_FACTORS)[dates.weekday]
+    weights = 1 + seasonality * (month * weekday - 1)
+    weights = np.clip(weights, 0.01, None)
+    return dates, weights / weights.sum()
+
+
+def generate_block(block, size, customers, dates, weights, service_mix, seed=DEFAULT_SEED):
+    """Generate one block of orders; a block's content depends only on seed and block number"""
+    rng = np.random.default_rng([seed, block + 1])
+
+    # A few regulars bring most of the orders (Zipf-like popularity)
+    ranks = np.arange(1, len(customers) + 1)
+    popularity = 1 / ranks ** 1.1
+    who = rng.choice(len(customers), size, p=popularity / popularity.sum())
+
+    day = rng.choice(len(dates), size, p=weights)
+    seconds = rng.integers(8 * 3600, 20 * 3600, size)   # shop hours
+
+    has = {service: rng.random(size) < share for service, share in service_mix.items()}
+    # Every order has at least one service
+    empty = ~(has['regular_clothes'] | has['blankets'] | has['white_clothes'])
+    has['regular_clothes'] |= empty
+
+    orders = pd.DataFrame({
+        'customer_name': customers['customer_name'].to_numpy()[who],
+        'mobile_number': customers['mobile_number'].to_numpy()[who],
+        'order_date': dates[day],
+        'regular_clothes_kg': np.where(has['regular_clothes'],
+                                       np.round(rng.gamma(2.5, 1.2, size) + 0.5, 1), 0.0),
+        'blankets_kg': np.where(has['blankets'], np.round(rng.uniform(0.5, 4.0, size), 1), 0.0),
+        'white_clothes_pieces': np.where(has['white_clothes'], rng.integers(1, 13, size), 0),
+    })
+    orders['regular_clothes_kg'] = orders['regular_clothes_kg'].clip(upper=99.9)
+    orders['created_at'] = orders['order_date'] + pd.to_timedelta(seconds, unit='s')
+    bill = pricing.price_orders(orders)
+    orders['total_amount'] = bill['total']
+    for column in pricing.COST_COLUMNS:
+        orders[column] = bill[column].round(2)
+    return orders
+
+
+def generate_orders(count, customers, start_date, days, seasonality=1.0,
+                    service_mix=None, seed=DEFAULT_SEED):
+    """Yield DataFrames of synthetic orders, BLOCK_SIZE rows at a time"""
+    service_mix = dict(DEFAULT_SERVICE_MIX, **(service_mix or {}))
+    dates, weights = day_weights(start_date, days, seasonality)
+    for block, start in enumerate(range(0, count, BLOCK_SIZE)):
+        yield generate_block(block, min(BLOCK_SIZE, count - start), customers,
+                             dates, weights, service_mix, seed)
+
+
+class ReceiptCounter:
+    """Numbers generated orders locally, continuing each day's existing sequence"""
+
+    def __init__(self, cursor):
+        cursor.execute('SELECT seq_date, last_value FROM receipt_sequences')
+        self.last = {pd.Timestamp(day): int(value) for day, value in cursor.fetchall()}
+
+    def assign(self, orders):
+        offsets = orders['order_date'].map(self.last).fillna(0).astype(int)
+        sequence = offsets + orders.groupby('order_date').cumcount() + 1
+        self.last.update(sequence.groupby(orders['order_date']).max().to_dict())
+        return ('RW-' + orders['order_date'].dt.strftime('%Y%m%d') + '-'
+                + sequence.astype(str).str.zfill(4))
+
+
+INSERT_SQL = '''
+    INSERT INTO orders (receipt_number, customer_name, mobile_number, order_date,
+                        regular_clothes_kg, blankets_kg, white_clothes_pieces,
+                        total_amount, regular_cost, blankets_cost, white_cost,
+                        pricing_version, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+
+def insert_orders(conn, blocks, count, batch_size=BATCH_SIZE, progress=True):
+    """Insert generated orders with batched multi-row INSERTs; returns totals"""
     cursor = conn.cursor()
-    
-    # Sample customer names
-    customers = [
-        "Rahul Sharma", "Priya Patel", "Amit Kumar", "Neha Singh", "Rajesh Verma",
-        "Sita Devi", "Mohan Das", "Anjali Gupta", "Vikram Malhotra", "Pooja Reddy",
-        "Sanjay Joshi", "Kavita Iyer", "Deepak Mehta", "Sunita Rao", "Arun Khanna",
-        "Meera Nair", "Suresh Menon", "Lakshmi Pillai", "Ganesh Krishnan", "Radha Venkat"
-    ]
-    
-    # Sample mobile numbers
-    mobile_numbers = [
-        "9876543210", "8765432109", "7654321098", "6543210987", "5432109876",
-        "9876543211", "8765432110", "7654321109", "6543211098", "5432109877",
-        "9876543212", "8765432111", "7654321110", "6543211109", "5432109878",
-        "9876543213", "8765432112", "7654321111", "6543211110", "5432109879"
-    ]
-    
-    # Generate orders for the last 30 days
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-    
-    sample_orders = []
-    
-    for i in range(50):  # Generate 50 sample orders
-        # Random date within the last 30 days
-        random_days = random.randint(0, 30)
-        order_date = start_date + timedelta(days=random_days)
-        
-        # Random customer
-        customer_idx = random.randint(0, len(customers) - 1)
-        customer_name = customers[customer_idx]
-        mobile_number = mobile_numbers[customer_idx]
-        
-        # Random service quantities
-        regular_kg = round(random.uniform(0, 5), 1)  # 0-5 kg
-        blankets_kg = round(random.uniform(0, 3), 1)  # 0-3 kg
-        white_pieces = random.randint(0, 10)  # 0-10 pieces
-        
-        # Calculate total amount
-        pricing = {
-            'regular_clothes': 50,
-            'blankets': 100,
-            'white_clothes': 40
-        }
-        
-        total_amount = (regular_kg * pricing['regular_clothes'] + 
-                       blankets_kg * pricing['blankets'] + 
-                       white_pieces * pricing['white_clothes'])
-        
-        # Create order record
-        order = {
-            'customer_name': customer_name,
-            'mobile_number': mobile_number,
-            'order_date': order_date.strftime('%Y-%m-%d'),
-            'regular_clothes_kg': regular_kg,
-            'blankets_kg': blankets_kg,
-            'white_clothes_pieces': white_pieces,
-            'total_amount': total_amount,
-            'created_at': order_date.strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        sample_orders.append(order)
-    
-    # Insert sample data
-    for order in sample_orders:
-        cursor.execute('''
-            INSERT INTO orders (customer_name, mobile_number, order_date, 
-                               regular_clothes_kg, blankets_kg, white_clothes_pieces, 
-                               total_amount, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        ''', (
-            order['customer_name'],
-            order['mobile_number'],
-            order['order_date'],
-            order['regular_clothes_kg'],
-            order['blankets_kg'],
-            order['white_clothes_pieces'],
-            order['total_amount'],
-            order['created_at']
+    counter = ReceiptCounter(cursor)
+    inserted = 0
+    revenue = 0.0
+    started = time.perf_counter()
+
+    for orders in blocks:
+        orders = orders.assign(receipt_number=counter.assign(orders))
+        rows = list(zip(
+            orders['receipt_number'].tolist(),
+            orders['customer_name'].tolist(),
+            orders['mobile_number'].tolist(),
+            orders['order_date'].dt.strftime('%Y-%m-%d').tolist(),
+            orders['regular_clothes_kg'].tolist(),
+            orders['blankets_kg'].tolist(),
+            orders['white_clothes_pieces'].tolist(),
+            orders['total_amount'].tolist(),
+            orders['regular_cost'].tolist(),
+            orders['blankets_cost'].tolist(),
+            orders['white_cost'].tolist(),
+            [pricing.PRICING_VERSION] * len(orders),
+            orders['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S').tolist(),
         ))
-    
-    # Commit changes
+        for start in range(0, len(rows), batch_size):
+            # mysql-connector turns executemany on an INSERT into one multi-row statement
+            cursor.executemany(INSERT_SQL, rows[start:start + batch_size])
+            conn.commit()
+        inserted += len(rows)
+        revenue += float(orders['total_amount'].sum())
+
+        if progress:
+            elapsed = time.perf_counter() - started
+            rate = inserted / elapsed if elapsed else 0
+            eta = (count - inserted) / rate if rate else 0
+            print(f"\r⏳ {inserted:,}/{count:,} orders ({rate:,.0f} rows/s, ~{eta:,.0f}s left)",
+                  end='', flush=True)
+
+    # Let the live allocator continue after the generated receipt numbers
+    cursor.execute(receipts.SEED_SQL)
     conn.commit()
-    
-    # Create CSV backup
-    df = pd.read_sql_query('SELECT * FROM orders ORDER BY created_at DESC', conn)
-    df.to_csv('orders.csv', index=False)
-    
-    conn.close()
-    
+    cursor.close()
+    if progress:
+        print()
+    return inserted, revenue, time.perf_counter() - started
+
+
+def create_sample_data(count=50, customer_count=20, days=30, seasonality=1.0,
+                       service_mix=None, seed=None, batch_size=BATCH_SIZE,
+                       start_date=None, end_date=None):
+    """Generate and insert sample data into the database.
+
+    Orders cover `days` days ending at end_date (default today). A seed gives
+    the same orders on any day once the dates are fixed.
+    """
+    seed = DEFAULT_SEED if seed is None else seed
+
+    if start_date and end_date:
+        days = (end_date - start_date).days + 1
+    elif start_date:
+        end_date = start_date + timedelta(days=days - 1)
+    else:
+        end_date = end_date or datetime.now().date()
+        start_date = end_date - timedelta(days=days - 1)
+
+    customers = make_customers(customer_count, seed)
+    blocks = generate_orders(count, customers, start_date, days, seasonality, service_mix, seed)
+
+    # Connect to the configured database
+    with storage.open_database().connection() as conn:
+        inserted, revenue, seconds = insert_orders(conn, blocks, count, batch_size)
+
+        # Refresh the daily summary rollup
+        rollup.rebuild(conn)
+
     print("✅ Sample data generated successfully!")
-    print(f"📊 Created {len(sample_orders)} sample orders")
-    print(f"👥 Used {len(set([order['customer_name'] for order in sample_orders]))} unique customers")
-    print(f"💰 Total revenue: ₹{sum([order['total_amount'] for order in sample_orders]):,.2f}")
+    print(f"📊 Created {inserted:,} sample orders in {seconds:.1f}s ({inserted / max(seconds, 1e-9):,.0f} rows/s)")
+    print(f"👥 Drawn from {customer_count:,} customers (seed {seed})")
+    print(f"💰 Total revenue: ₹{revenue:,.2f}")
     print(f"📅 Date range: {start_date.strftime('%B %d, %Y')} to {end_date.strftime('%B %d, %Y')}")
     print("\n🎯 You can now run 'streamlit run app.py' to see the sample data!")
 
 def clear_sample_data():
     """Clear all data from the database"""
-    conn = mysql.connector.connect(**DB_CONFIG)
-    cursor = conn.cursor()
-    
-    cursor.execute('DELETE FROM orders')
-    conn.commit()
-    conn.close()
-    
+    OrderRepository(storage.open_database()).clear()
+
     print("🗑️ All sample data cleared from database!")
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate synthetic Express Wash orders")
+    parser.add_argument('--orders', type=int, default=50, help="number of orders (default 50)")
+    parser.add_argument('--customers', type=int, default=20, help="number of distinct customers")
+    parser.add_argument('--days', type=int, default=30, help="days of history (default 30)")
+    parser.add_argument('--start-date', type=date.fromisoformat, help="first order date, YYYY-MM-DD")
+    parser.add_argument('--end-date', type=date.fromisoformat,
+                        help="last order date, YYYY-MM-DD (default today)")
+    parser.add_argument('--seasonality', type=float, default=1.0,
+                        help="0 = flat, 1 = default monthly/weekday swings")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="rows per INSERT")
+    for service, share in DEFAULT_SERVICE_MIX.items():
+        parser.add_argument(f"--{service.replace('_', '-')}", type=float, default=share,
+                            help=f"share of orders with {service.replace('_', ' ')} (default {share})")
+    parser.add_argument('--clear', action='store_true', help="delete all orders instead")
+    args = parser.parse_args(argv)
+    if args.start_date and args.end_date and args.start_date > args.end_date:
+        parser.error("--start-date must not be after --end-date")
+    return args
+
 if __name__ == "__main__":
     print("🧺 Express Wash - Sample Data Generator")
     print("=" * 50)
-    
+
+    if len(sys.argv) > 1:
+        args = parse_args(sys.argv[1:])
+        try:
+            if args.clear:
+                clear_sample_data()
+            else:
+                create_sample_data(args.orders, args.customers, args.days, args.seasonality,
+                                   {service: getattr(args, service) for service in DEFAULT_SERVICE_MIX},
+                                   args.seed, args.batch_size, args.start_date, args.end_date)
+        except storage.DatabaseError as e:
+            print(f"❌ Database error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
     choice = input("Choose an option:\n1. Generate sample data\n2. Clear all data\nEnter choice (1 or 2): ")
-    
+
     if choice == "1":
         create_sample_data()
     elif choice == "2":
         clear_sample_data()
     else:
-        print("❌ Invalid choice. Please run the script again.") 
\ No newline at end of file
+        print("❌ Invalid choice. Please run the script again.")
@@ -0,0 +1,122 @@
+"""
+Order Search Index for Express Wash Laundry Billing System
+In-memory index over customer name, mobile number and receipt number. Short
+queries are answered from a sorted list of word prefixes, longer ones from a
+trigram index, so a search never has to scan every order.
+"""
+
+from bisect import bisect_left, insort
+
+# Positions of the searchable fields in an order row
+# (id, receipt_number, customer_name, mobile_number, ...)
+SEARCH_FIELDS = (2, 3, 1)
+
+GRAM_SIZE = 3
+
+
+def _grams(text):
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class OrderSearchIndex:
+    """Maps search terms to order ids; build once per load, update on edits"""
+
+    def __init__(self, rows=(), key=lambda row: row[0]):
+        self.key = key
+        self._texts = {}      # order id -> lowercased searchable fields
+        self._terms = []      # sorted (term, order id) pairs for prefix lookups
+        self._grams = {}      # trigram -> set of order ids
+        self._last = None     # (query, result) of the previous search
+        for row in rows:
+            self._add(row)
+        self._terms.sort()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _fields(self, row):
+        # Whitespace is collapsed so stray or doubled spaces do not hide a match
+        return [' '.join(str(row[i]).split()).lower() for i in SEARCH_FIELDS if row[i]]
+
+    def _row_terms(self, key, fields):
+        # Every word of every field, plus whole fields so "98765" or "rw-2025"
+        # match from the start of a mobile or receipt number
+        terms = set(fields)
+        for field in fields:
+            terms.update(field.split())
+        return [(term, key) for term in terms]
+
+    def _add(self, row, keep_sorted=False):
+        key = self.key(row)
+        fields = self._fields(row)
+        self._texts[key] = '\n'.join(fields)
+        for pair in self._row_terms(key, fields):
+            if keep_sorted:
+                insort(self._terms, pair)
+            else:
+                self._terms.append(pair)
+        for field in fields:
+            for gram in _grams(field):
+                self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        """Drop an order from the index"""
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        fields = text.split('\n')
+        for pair in self._row_terms(key, fields):
+            i = bisect_left(self._terms, pair)
+            if i < len(self._terms) and self._terms[i] == pair:
+                del self._terms[i]
+        for field in fields:
+            for gram in _grams(field):
+                keys = self._grams.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._grams[gram]
+        self._last = None
+
+    def update(self, row):
+        """Re-index an order after it was added or edited"""
+        self.remove(self.key(row))
+        self._add(row, keep_sorted=True)
+        self._last = None
+
+    def search(self, query):
+        """Return the set of matching order ids, or None when the query is empty"""
+        query = ' '.join(query.split()).lower()
+        if not query:
+            return None
+
+        if len(query) < GRAM_SIZE:
+            result = self._prefix_search(query)
+        elif (self._last is not None and len(self._last[0]) >= GRAM_SIZE
+              and query.startswith(self._last[0])):
+            # Typing one more character can only narrow the previous substring match
+            result = {key for key in self._last[1] if query in self._texts[key]}
+        else:
+            result = self._gram_search(query)
+        self._last = (query, result)
+        return result
+
+    def _prefix_search(self, query):
+        result = set()
+        i = bisect_left(self._terms, (query,))
+        while i < len(self._terms) and self._terms[i][0].startswith(query):
+            result.add(self._terms[i][1])
+            i += 1
+        return result
+
+    def _gram_search(self, query):
+        # Intersect the rarest trigrams first, then confirm the substring
+        candidates = None
+        for gram in sorted(_grams(query), key=lambda g: len(self._grams.get(g, ()))):
+            keys = self._grams.get(gram)
+            if not keys:
+                return set()
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                return set()
+        return {key for key in candidates if query in self._texts[key]}
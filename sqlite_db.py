@@ -0,0 +1,280 @@
+"""
+SQLite Engine for Express Wash Laundry Billing System
+Runs the application's MySQL-dialect SQL on an in-process SQLite database.
+Connections translate the handful of MySQL constructs the code base uses
+(%s placeholders, ON DUPLICATE KEY UPDATE, LAST_INSERT_ID, STR_TO_DATE, ...), so
+the same queries, migrations and rollup code work on both engines.
+"""
+
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# MySQL construct -> SQLite equivalent, applied in order
+_TRANSLATIONS = [
+    (re.compile(r'\bINT AUTO_INCREMENT PRIMARY KEY\b', re.I), 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    (re.compile(r'\bDEFAULT CURRENT_TIMESTAMP\b', re.I), "DEFAULT (datetime('now', 'localtime'))"),
+    (re.compile(r'\bON DUPLICATE KEY UPDATE\b', re.I), 'ON CONFLICT DO UPDATE SET'),
+    (re.compile(r'\bVALUES\((\w+)\)', re.I), r'excluded.\1'),
+    (re.compile(r'\bGREATEST\(', re.I), 'MAX('),
+    (re.compile(r'\bLEAST\(', re.I), 'MIN('),
+    (re.compile(r'\s+FOR UPDATE\b', re.I), ''),
+    # MySQL escapes LIKE wildcards with a backslash by default; SQLite needs it spelled out
+    (re.compile(r'\bLIKE %s', re.I), "LIKE %s ESCAPE '\\\\'"),
+    (re.compile(r'%s'), '?'),
+]
+
+BUSY_TIMEOUT = 10   # seconds a writer waits for another writer's lock
+DEFAULT_POOL_SIZE = 5
+DEFAULT_CHECKOUT_TIMEOUT = 10   # seconds to wait for a free connection
+
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """Rewrite a MySQL-dialect statement for SQLite"""
+    for pattern, replacement in _TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+# Python values the MySQL connector accepts, stored the way MySQL formats them
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.strftime('%Y-%m-%d %H:%M:%S'))
+sqlite3.register_adapter(pd.Timestamp, lambda d: d.strftime('%Y-%m-%d %H:%M:%S'))
+sqlite3.register_adapter(Decimal, float)
+for _type in (np.int8, np.int16, np.int32, np.int64):
+    sqlite3.register_adapter(_type, int)
+sqlite3.register_adapter(np.float32, float)
+sqlite3.register_adapter(np.bool_, bool)
+
+# DATE and TIMESTAMP columns come back as date/datetime objects, as with MySQL
+sqlite3.register_converter('DATE', lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+
+
+def _str_to_date(text, fmt):
+    try:
+        return datetime.strptime(text, fmt).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _substring_index(text, delimiter, count):
+    if text is None:
+        return None
+    parts = text.split(delimiter)
+    return delimiter.join(parts[:count] if count > 0 else parts[count:])
+
+
+class SQLiteCursor:
+    """DB-API cursor that accepts MySQL-dialect SQL"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate(sql), tuple(params or ()))
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(translate(sql), rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the MySQL functions the application calls"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                     timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._last_insert_id = 0
+
+        def last_insert_id(*value):
+            # LAST_INSERT_ID(expr) stores expr for the next LAST_INSERT_ID()
+            if value:
+                self._last_insert_id = value[0]
+                return value[0]
+            return self._last_insert_id
+
+        self._conn.create_function('LAST_INSERT_ID', -1, last_insert_id)
+        self._conn.create_function('STR_TO_DATE', 2, _str_to_date, deterministic=True)
+        self._conn.create_function('SUBSTRING_INDEX', 3, _substring_index, deterministic=True)
+
+        if path != ':memory:':
+            # WAL lets readers run while a writer commits
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+class SQLiteDatabase:
+    """One SQLite database file shared by the process, with the pool's interface.
+
+    Up to pool_size connections are opened lazily and reused by whichever
+    thread borrows them; ``connection()`` and ``stats()`` behave like
+    ConnectionPool so callers need not care which engine is behind. An
+    in-memory database is a pool of one connection that threads take turns on.
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, path, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        self.path = path
+        self.db_config = {'database': path}
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stats = {'checkouts': 0, 'connects': 0, 'in_use': 0, 'waits': 0, 'timeouts': 0,
+                       'max_wait_ms': 0.0, 'total_wait_ms': 0.0}
+        if path == ':memory:':
+            # An in-memory database exists per connection, so share one; it is
+            # not thread-safe, hence a single slot
+            self._shared = self._connect()
+            self.pool_size = 1
+            self._idle = queue.LifoQueue(maxsize=1)
+            self._idle.put(self._shared)
+        else:
+            self._shared = None
+            # None marks a slot that has not been connected yet
+            self._idle = queue.LifoQueue(maxsize=pool_size)
+            for _ in range(pool_size):
+                self._idle.put(None)
+
+    def _connect(self):
+        conn = SQLiteConnection(self.path)
+        with self._lock:
+            self._stats['connects'] += 1
+        return conn
+
+    def _checkout(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            started = time.monotonic()
+            with self._lock:
+                self._stats['waits'] += 1
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                raise sqlite3.OperationalError(
+                    f"No database connection available after {self.timeout}s (pool size {self.pool_size})")
+            waited_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                self._stats['total_wait_ms'] += waited_ms
+                self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], waited_ms)
+        if conn is None:
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                # Give the slot back so a failed connect does not shrink the pool
+                self._idle.put(None)
+                raise
+        return conn
+
+    def _checkin(self, conn):
+        try:
+            # Never leave a transaction open for the next caller
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            if conn is self._shared:
+                self._idle.put(conn)
+                raise
+            # Replaced by a fresh connection on the next checkout
+            conn.close()
+            conn = None
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block"""
+        conn = self._checkout()
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._checkin(conn)
+
+    def stats(self):
+        """Usage counters in the same shape as ConnectionPool.stats()"""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot['pool_size'] = self.pool_size
+        snapshot['idle'] = self._idle.qsize()
+        waits = snapshot['waits'] - snapshot['timeouts']
+        snapshot['avg_wait_ms'] = snapshot['total_wait_ms'] / waits if waits else 0.0
+        snapshot.update(reconnects=0, discarded=0, connection_errors=0)
+        return snapshot
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
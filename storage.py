@@ -0,0 +1,99 @@
+"""
+Storage Backends for Express Wash Laundry Billing System
+Chooses the database engine behind every entry point: a MySQL server through
+the shared connection pool, or an embedded SQLite file in WAL mode for
+single-shop installs that do not run a server. Both hand out connections
+through the same ``connection()`` context manager and accept the same SQL.
+
+The command-line tools and the desktop app read their settings from
+EXPRESS_WASH_* environment variables; the Streamlit app from its secrets.
+"""
+
+import os
+import sqlite3
+import threading
+
+import mysql.connector
+
+from db_pool import DEFAULT_POOL_SIZE, DEFAULT_CHECKOUT_TIMEOUT, get_pool
+from sqlite_db import SQLiteDatabase
+
+BACKENDS = ('mysql', 'sqlite')
+DEFAULT_BACKEND = 'mysql'
+DEFAULT_SQLITE_PATH = 'express_wash.db'
+
+# MySQL server used when nothing else is configured
+MYSQL_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+# Errors either engine can raise from a query
+DatabaseError = (mysql.connector.Error, sqlite3.Error)
+
+# One SQLite database object per file, shared by the whole process
+_sqlite_databases = {}
+_sqlite_lock = threading.Lock()
+
+
+def settings_from_env():
+    """Storage settings from EXPRESS_WASH_* environment variables"""
+    mysql_config = dict(MYSQL_CONFIG)
+    for key, variable in (('host', 'EXPRESS_WASH_DB_HOST'), ('user', 'EXPRESS_WASH_DB_USER'),
+                          ('password', 'EXPRESS_WASH_DB_PASS'), ('database', 'EXPRESS_WASH_DB_NAME')):
+        if variable in os.environ:
+            mysql_config[key] = os.environ[variable]
+    return {
+        'backend': os.environ.get('EXPRESS_WASH_DB_BACKEND', DEFAULT_BACKEND),
+        'mysql_config': mysql_config,
+        'sqlite_path': os.environ.get('EXPRESS_WASH_SQLITE_PATH', DEFAULT_SQLITE_PATH),
+    }
+
+
+def get_database(backend=DEFAULT_BACKEND, mysql_config=None, sqlite_path=DEFAULT_SQLITE_PATH,
+                 pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT):
+    """Return the process-wide database for these settings"""
+    backend = backend.lower()
+    if backend == 'mysql':
+        return get_pool(mysql_config or MYSQL_CONFIG, pool_size=pool_size, timeout=timeout)
+    if backend == 'sqlite':
+        path = os.path.abspath(sqlite_path) if sqlite_path != ':memory:' else sqlite_path
+        with _sqlite_lock:
+            db = _sqlite_databases.get(path)
+            if db is None:
+                db = SQLiteDatabase(path, pool_size=pool_size, timeout=timeout)
+                _sqlite_databases[path] = db
+            return db
+    raise ValueError(f"Unknown database backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+
+
+def open_database(**overrides):
+    """Return the database configured by the environment, with optional overrides"""
+    settings = settings_from_env()
+    settings.update(overrides)
+    return get_database(**settings)
+
+
+def dialect(db):
+    """'mysql' or 'sqlite'"""
+    return getattr(db, 'dialect', 'mysql')
+
+
+def describe(db):
+    """Human-readable name of the database, for status messages"""
+    if dialect(db) == 'sqlite':
+        return f"SQLite ({db.path})"
+    return f"MySQL ({db.db_config.get('database')} on {db.db_config.get('host', 'localhost')})"
+
+
+def create_database(db):
+    """Create the MySQL database if it is missing; SQLite files are created on first use"""
+    if dialect(db) != 'mysql':
+        return
+    server_config = {k: v for k, v in db.db_config.items() if k != 'database'}
+    conn = mysql.connector.connect(**server_config)
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db.db_config['database']}")
+    conn.close()
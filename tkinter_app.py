@@ -6,13 +6,37 @@ Modern GUI with CRUD operations, beautiful styling, and professional design
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import mysql.connector
-import pandas as pd
 from datetime import datetime, date
 import json
 import os
 from PIL import Image, ImageTk
 import threading
+import queue
+import storage
+from repository import OrderRepository
+import exports
+import bootstrap
+from virtual_list import VirtualOrderList
+from search_index import OrderSearchIndex
+import customer_lookup
+from pricing import PRICING
+
+# Rows inserted into the order history per Tk event-loop turn
+LOAD_CHUNK_SIZE = 500
+
+# Above this many orders the history switches to the virtual list, which only
+# creates Treeview items for the rows in view
+VIRTUAL_LIST_THRESHOLD = 5000
+
+# Wait this long after the last keystroke before filtering the history
+SEARCH_DEBOUNCE_MS = 200
+
+# Columns of an order history row, in the order the history keeps them
+ORDER_ROW_SQL = '''
+    SELECT id, receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg,
+           blankets_kg, white_clothes_pieces, total_amount, created_at
+    FROM orders
+'''
 
 class ExpressWashApp:
     def __init__(self, root):
@@ -21,20 +45,31 @@ class ExpressWashApp:
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f8ff')
         
-        # Database configuration
-        self.DB_CONFIG = {
-            'host': 'localhost',
-            'user': 'root',
-            'password': '16021995',
-            'database': 'express_wash'
-        }
-        
-        # Pricing configuration
-        self.PRICING = {
-            'regular_clothes': 50,  # ₹50/kg
-            'blankets': 100,        # ₹100/kg
-            'white_clothes': 40     # ₹40/piece
-        }
+        # Database chosen by the EXPRESS_WASH_DB_* environment variables
+        # (the desktop app only needs a couple of pooled sessions)
+        self.db = storage.open_database(pool_size=3)
+        
+        # Receipt numbers reserved per terminal (1 = reserve inside each save)
+        self.RECEIPT_BLOCK_SIZE = int(os.environ.get('EXPRESS_WASH_RECEIPT_BLOCK_SIZE', 1))
+        self.repository = OrderRepository(self.db, self.RECEIPT_BLOCK_SIZE)
+        
+        # Background order loading: results arrive on a queue polled by the Tk
+        # main thread; each reload gets a new generation so stale work is dropped
+        self._load_queue = queue.Queue()
+        self._load_generation = 0
+        self._polling = False
+        self._order_iids = []   # every row item, including ones detached by the filter
+        
+        # Search: index built with each load; the filter only touches rows
+        # whose visibility changes
+        self.search_index = OrderSearchIndex()
+        self._search_after_id = None
+        self._iid_positions = {}   # row item -> position in load order
+        self._visible_iids = set()
+        self._customer_index = None   # fuzzy customer lookup, built on first use
+        
+        # Pricing configuration (shared with the web app)
+        self.PRICING = PRICING
         
         # Initialize database
         self.init_database()
@@ -46,34 +81,11 @@ class ExpressWashApp:
         self.load_orders()
         
     def init_database(self):
-        """Initialize MySQL database connection"""
+        """Initialize the database connection and apply pending schema migrations"""
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            # Add receipt_number column if not exists
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    receipt_number VARCHAR(32) UNIQUE,
-                    customer_name VARCHAR(255) NOT NULL,
-                    mobile_number VARCHAR(20),
-                    order_date DATE NOT NULL,
-                    regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                    blankets_kg DECIMAL(5,2) DEFAULT 0,
-                    white_clothes_pieces INT DEFAULT 0,
-                    total_amount DECIMAL(10,2) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            # Add receipt_number column if upgrading
-            try:
-                cursor.execute('ALTER TABLE orders ADD COLUMN receipt_number VARCHAR(32) UNIQUE')
-            except Exception:
-                pass
-            conn.commit()
-            conn.close()
-            print("✅ Database initialized successfully!")
-        except mysql.connector.Error as err:
+            bootstrap.ensure_schema(self.db)
+            print(f"✅ Database initialized successfully! ({storage.describe(self.db)})")
+        except storage.DatabaseError as err:
             messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
     
     def create_widgets(self):
@@ -234,6 +246,14 @@ class ExpressWashApp:
         self.search_entry.pack(side='left', padx=(5, 10))
         self.search_var.trace('w', self.filter_orders)
         
+        self.find_customer_button = tk.Button(search_frame, text="👤 Find Customer",
+                                              command=self.find_customer,
+                                              font=('Arial', 9, 'bold'),
+                                              bg='#e0e7ff', fg='#1e3a8a',
+                                              relief='raised', bd=1,
+                                              padx=8, pady=2)
+        self.find_customer_button.pack(side='left')
+        
         # CRUD Buttons
         crud_frame = tk.Frame(history_frame, bg='white')
         crud_frame.pack(fill='x', pady=(0, 10))
@@ -270,6 +290,12 @@ class ExpressWashApp:
                                       padx=15, pady=5)
         self.export_button.pack(side='left')
         
+        # Loading indicator
+        self.status_var = tk.StringVar()
+        self.status_label = tk.Label(crud_frame, textvariable=self.status_var,
+                                     font=('Arial', 9, 'italic'), bg='white', fg='#6b7280')
+        self.status_label.pack(side='right')
+        
         # Treeview for orders
         tree_frame = tk.Frame(history_frame, bg='white')
         tree_frame.pack(fill='both', expand=True)
@@ -311,22 +337,9 @@ class ExpressWashApp:
         # Bind selection event
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
         
-    def generate_receipt_number(self):
-        """Generate a unique, sequential receipt number for today"""
-        today_str = date.today().strftime('%Y%m%d')
-        prefix = f"RW-{today_str}-"
-        conn = mysql.connector.connect(**self.DB_CONFIG)
-        cursor = conn.cursor()
-        cursor.execute("SELECT receipt_number FROM orders WHERE receipt_number LIKE %s ORDER BY id DESC LIMIT 1", (prefix+'%',))
-        last = cursor.fetchone()
-        conn.close()
-        if last and last[0]:
-            last_num = int(last[0].split('-')[-1])
-            next_num = last_num + 1
-        else:
-            next_num = 1
-        return f"{prefix}{next_num:04d}"
-    
+        # Virtual list mode for large histories (binds its own handlers after ours)
+        self.virtual_list = VirtualOrderList(self.tree, scrollbar, self._format_order_row)
+        
     def calculate_bill(self):
         """Calculate and display bill"""
         try:
@@ -368,17 +381,13 @@ class ExpressWashApp:
             total = (regular_kg * self.PRICING['regular_clothes'] + 
                     blankets_kg * self.PRICING['blankets'] + 
                     white_pieces * self.PRICING['white_clothes'])
-            receipt_number = self.generate_receipt_number()
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO orders (receipt_number, customer_name, mobile_number, order_date, 
-                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (receipt_number, customer_name, mobile_number, order_date, regular_kg, blankets_kg, white_pieces, total))
-            conn.commit()
-            conn.close()
-            messagebox.showinfo("Success", f"✅ Order saved successfully!\nReceipt Number: {receipt_number}")
+            order_data = {
+                'customer_name': customer_name, 'mobile_number': mobile_number, 'order_date': order_date,
+                'regular_clothes_kg': regular_kg, 'blankets_kg': blankets_kg,
+                'white_clothes_pieces': white_pieces, 'total_amount': total
+            }
+            self.repository.save_order(order_data)
+            messagebox.showinfo("Success", f"✅ Order saved successfully!\nReceipt Number: {order_data['receipt_number']}")
             self.clear_form()
             self.load_orders()
         except Exception as e:
@@ -395,42 +404,235 @@ class ExpressWashApp:
         self.bill_text.delete(1.0, tk.END)
     
     def load_orders(self):
-        """Load orders from database"""
+        """Reload orders in the background; a newer reload cancels this one"""
+        self._load_generation += 1
+        generation = self._load_generation
+        self._customer_index = None
+        self.status_var.set("⏳ Loading orders...")
+        self.refresh_button.config(state='disabled')
+        
+        worker = threading.Thread(target=self._fetch_orders, args=(generation,), daemon=True)
+        worker.start()
+        if not self._polling:
+            self._polling = True
+            self.root.after(50, self._poll_load_queue)
+    
+    def _fetch_orders(self, generation):
+        """Worker thread: run the query and hand the rows to the Tk thread"""
         try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            cursor.execute('SELECT id, receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, created_at FROM orders ORDER BY created_at DESC')
-            orders = cursor.fetchall()
-            for order in orders:
-                self.tree.insert('', 'end', values=(
-                    order[1],  # Receipt Number (shown instead of ID)
-                    order[2],  # Customer Name
-                    order[3] or "",  # Mobile
-                    order[4],  # Order Date
-                    f"{order[5]:.1f}",  # Regular kg
-                    f"{order[6]:.1f}",  # Blankets kg
-                    order[7],  # White pieces
-                    f"₹{order[8]:.2f}",  # Total
-                    order[9].strftime('%Y-%m-%d %H:%M') if order[9] else ""  # Created
-                ))
-            conn.close()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(ORDER_ROW_SQL + ' ORDER BY created_at DESC')
+                orders = [self._compact_row(row) for row in cursor]
+            # Index here too, so the Tk thread never pays for it
+            self._load_queue.put((generation, orders, OrderSearchIndex(orders), None))
         except Exception as e:
-            messagebox.showerror("Error", f"Error loading orders: {str(e)}")
+            self._load_queue.put((generation, None, None, e))
+    
+    def _compact_row(self, row):
+        """Order row with plain floats instead of Decimal objects"""
+        return (row[0], row[1], row[2], row[3], row[4], float(row[5]), float(row[6]),
+                int(row[7]), float(row[8]), row[9])
+    
+    def _poll_load_queue(self):
+        """Tk thread: pick up finished loads, ignoring ones that were superseded"""
+        try:
+            while True:
+                generation, orders, search_index, error = self._load_queue.get_nowait()
+                if generation != self._load_generation:
+                    continue
+                self._polling = False
+                if error is not None:
+                    self._finish_loading()
+                    messagebox.showerror("Error", f"Error loading orders: {str(error)}")
+                    return
+                # One Tcl call for the whole clear, detached rows included
+                if self._order_iids:
+                    self.tree.delete(*self._order_iids)
+                self._order_iids = []
+                self._iid_positions = {}
+                self._visible_iids = set()
+                self.search_index = search_index
+                
+                if len(orders) > VIRTUAL_LIST_THRESHOLD:
+                    self.virtual_list.attach()
+                    self.virtual_list.set_rows(orders)
+                    self._finish_loading()
+                    self.status_var.set(f"{len(orders):,} orders")
+                    if self.search_var.get():
+                        self._apply_search()
+                else:
+                    self.virtual_list.detach()
+                    self._insert_order_chunk(generation, orders, 0)
+                return
+        except queue.Empty:
+            self.root.after(50, self._poll_load_queue)
+    
+    def _insert_order_chunk(self, generation, orders, start):
+        """Tk thread: insert one chunk of rows, then yield to the event loop"""
+        if generation != self._load_generation:
+            return
+        end = min(start + LOAD_CHUNK_SIZE, len(orders))
+        for order in orders[start:end]:
+            # The item id is the order id; the first column shows the receipt number
+            iid = str(order[0])
+            self.tree.insert('', 'end', iid=iid, values=self._format_order_row(order))
+            self._iid_positions[iid] = len(self._order_iids)
+            self._order_iids.append(iid)
+            self._visible_iids.add(iid)
+        if end < len(orders):
+            self.status_var.set(f"⏳ Loading orders... {end:,}/{len(orders):,}")
+            self.root.after(1, self._insert_order_chunk, generation, orders, end)
+        else:
+            self._finish_loading()
+            self.status_var.set(f"{len(orders):,} orders")
+            if self.search_var.get():
+                self._apply_search()
+    
+    def _format_order_row(self, order):
+        """Display values for one order row"""
+        return (
+            order[1] or "",  # Receipt Number (shown instead of ID)
+            order[2],  # Customer Name
+            order[3] or "",  # Mobile
+            order[4],  # Order Date
+            f"{order[5]:.1f}",  # Regular kg
+            f"{order[6]:.1f}",  # Blankets kg
+            order[7],  # White pieces
+            f"₹{order[8]:.2f}",  # Total
+            order[9].strftime('%Y-%m-%d %H:%M') if order[9] else ""  # Created
+        )
+    
+    def _selected_order(self):
+        """Return (order_id, display values) for the selected order, or None"""
+        if self.virtual_list.active:
+            # The selected row may be scrolled out of view, so read the store
+            order = self.virtual_list.selected_row()
+            return (order[0], self._format_order_row(order)) if order else None
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return int(selection[0]), self.tree.item(selection[0])['values']
+    
+    def _finish_loading(self):
+        self.status_var.set("")
+        self.refresh_button.config(state='normal')
     
     def filter_orders(self, *args):
-        """Filter orders based on search term"""
-        search_term = self.search_var.get().lower()
-        
-        for item in self.tree.get_children():
-            values = self.tree.item(item)['values']
-            customer_name = values[1].lower() if values[1] else ""
-            
-            if search_term in customer_name:
-                self.tree.reattach(item, '', 'end')
+        """Filter orders once the user pauses typing"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._apply_search)
+    
+    def _apply_search(self):
+        """Show the orders matching the search box (name, mobile or receipt number)"""
+        self._search_after_id = None
+        matches = self.search_index.search(self.search_var.get())
+        
+        if self.virtual_list.active:
+            if matches is None:
+                self.virtual_list.set_view(list(range(len(self.virtual_list.rows))))
             else:
-                self.tree.detach(item)
+                positions = self.virtual_list.positions
+                self.virtual_list.set_view(sorted(positions[str(key)] for key in matches))
+            return
+        
+        if matches is None:
+            wanted = set(self._order_iids)
+        else:
+            wanted = {str(key) for key in matches} & self._iid_positions.keys()
+        
+        # Only rows whose visibility changes are touched
+        hidden = self._visible_iids - wanted
+        if hidden:
+            self.tree.detach(*hidden)
+        shown = wanted - self._visible_iids
+        if shown:
+            # Reattach in load order; each row's final index is its rank among the visible rows
+            ranked = sorted(wanted, key=self._iid_positions.__getitem__)
+            for index, iid in enumerate(ranked):
+                if iid in shown:
+                    self.tree.move(iid, '', index)
+        self._visible_iids = wanted
+    
+    def _refresh_order(self, order_id):
+        """Re-read one edited order and update its row and search entry in place"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ORDER_ROW_SQL + ' WHERE id = %s', (order_id,))
+            row = cursor.fetchone()
+        if row is None:
+            self.load_orders()
+            return
+        
+        order = self._compact_row(row)
+        self.search_index.update(order)
+        self._customer_index = None
+        iid = str(order_id)
+        if self.virtual_list.active:
+            position = self.virtual_list.positions.get(iid)
+            if position is not None:
+                self.virtual_list.rows[position] = order
+        elif self.tree.exists(iid):
+            self.tree.item(iid, values=self._format_order_row(order))
+        # Re-filter: the edit may change whether the order matches the search
+        self._apply_search()
+    
+    def find_customer(self):
+        """Fuzzy customer lookup; picking a customer filters the history by name"""
+        try:
+            if self._customer_index is None:
+                with self.db.connection() as conn:
+                    self._customer_index = customer_lookup.load_customers(conn)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error loading customers: {str(e)}")
+            return
+        customer_index = self._customer_index
+        
+        find_window = tk.Toplevel(self.root)
+        find_window.title("👤 Find Customer")
+        find_window.geometry("420x360")
+        find_window.configure(bg='#f0f8ff')
+        
+        tk.Label(find_window, text="Name or mobile (typos are fine):", font=('Arial', 10, 'bold'),
+                 bg='#f0f8ff').pack(anchor='w', padx=15, pady=(15, 5))
+        query_var = tk.StringVar()
+        query_entry = tk.Entry(find_window, textvariable=query_var, font=('Arial', 11))
+        query_entry.pack(fill='x', padx=15)
+        query_entry.focus_set()
+        
+        results_list = tk.Listbox(find_window, font=('Arial', 10), activestyle='dotbox')
+        results_list.pack(fill='both', expand=True, padx=15, pady=10)
+        matches = []
+        pending = [None]
+        
+        def run_search():
+            pending[0] = None
+            matches[:] = [customer for customer, _ in customer_index.search(query_var.get())]
+            results_list.delete(0, tk.END)
+            for customer in matches:
+                mobile = f" • {customer['mobile_number']}" if customer['mobile_number'] else ""
+                results_list.insert(tk.END, f"{customer['customer_name']}{mobile} "
+                                            f"({customer['order_count']} orders)")
+            if matches:
+                results_list.selection_set(0)
+        
+        def on_type(*args):
+            if pending[0] is not None:
+                find_window.after_cancel(pending[0])
+            pending[0] = find_window.after(SEARCH_DEBOUNCE_MS, run_search)
+        
+        def choose(event=None):
+            selection = results_list.curselection()
+            if not selection:
+                return
+            self.search_var.set(matches[selection[0]]['customer_name'])
+            find_window.destroy()
+        
+        query_var.trace('w', on_type)
+        results_list.bind('<Double-Button-1>', choose)
+        query_entry.bind('<Return>', choose)
+        results_list.bind('<Return>', choose)
     
     def on_select(self, event):
         """Handle order selection"""
@@ -446,28 +648,24 @@ class ExpressWashApp:
     
     def edit_order(self):
         """Edit selected order"""
-        selection = self.tree.selection()
-        if not selection:
+        selected = self._selected_order()
+        if not selected:
             messagebox.showwarning("Warning", "Please select an order to edit!")
             return
         
         # Get selected order data
-        item = self.tree.item(selection[0])
-        values = item['values']
+        order_id, values = selected
         
         # Create edit window
-        self.create_edit_window(values)
+        self.create_edit_window(order_id, values)
     
-    def create_edit_window(self, order_data):
+    def create_edit_window(self, order_id, order_data):
         """Create edit order window"""
         edit_window = tk.Toplevel(self.root)
         edit_window.title("✏️ Edit Order")
         edit_window.geometry("500x600")
         edit_window.configure(bg='#f0f8ff')
         
-        # Order ID
-        order_id = order_data[0]
-        
         # Create form similar to main form
         form_frame = tk.LabelFrame(edit_window, text="Edit Order Details", 
                                   font=('Arial', 12, 'bold'),
@@ -516,25 +714,21 @@ class ExpressWashApp:
                         white_pieces_var.get() * self.PRICING['white_clothes'])
                 
                 # Update database
-                conn = mysql.connector.connect(**self.DB_CONFIG)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    UPDATE orders 
-                    SET customer_name = %s, mobile_number = %s, order_date = %s,
-                        regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
-                        total_amount = %s
-                    WHERE id = %s
-                ''', (customer_name_var.get(), mobile_var.get(), order_date_var.get(),
-                     regular_kg_var.get(), blankets_kg_var.get(), white_pieces_var.get(),
-                     total, order_id))
-                
-                conn.commit()
-                conn.close()
+                updated = self.repository.update_order(order_id, {
+                    'customer_name': customer_name_var.get(), 'mobile_number': mobile_var.get(),
+                    'order_date': order_date_var.get(), 'regular_clothes_kg': regular_kg_var.get(),
+                    'blankets_kg': blankets_kg_var.get(), 'white_clothes_pieces': white_pieces_var.get(),
+                    'total_amount': total
+                })
+                if not updated:
+                    messagebox.showerror("Error", "Order not found. It may have been deleted.")
+                    edit_window.destroy()
+                    self.load_orders()
+                    return
                 
                 messagebox.showinfo("Success", "✅ Order updated successfully!")
                 edit_window.destroy()
-                self.load_orders()
+                self._refresh_order(order_id)
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Error updating order: {str(e)}")
@@ -549,8 +743,8 @@ class ExpressWashApp:
     
     def delete_order(self):
         """Delete selected order"""
-        selection = self.tree.selection()
-        if not selection:
+        selected = self._selected_order()
+        if not selected:
             messagebox.showwarning("Warning", "Please select an order to delete!")
             return
         
@@ -561,17 +755,11 @@ class ExpressWashApp:
             return
         
         try:
-            # Get order ID
-            item = self.tree.item(selection[0])
-            order_id = item['values'][0]
+            # Get order ID (the item id; the first column is the receipt number)
+            order_id = selected[0]
             
             # Delete from database
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
-            conn.commit()
-            conn.close()
+            self.repository.delete_order(order_id)
             
             messagebox.showinfo("Success", "✅ Order deleted successfully!")
             self.load_orders()
@@ -580,21 +768,23 @@ class ExpressWashApp:
             messagebox.showerror("Error", f"Error deleting order: {str(e)}")
     
     def export_data(self):
-        """Export data to CSV"""
+        """Export data to CSV (gzip-compressed for .gz file names) or an Excel report"""
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                title="Export Orders to CSV"
+                filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz"),
+                           ("Excel report", "*.xlsx"), ("All files", "*.*")],
+                title="Export Orders"
             )
             
             if filename:
-                conn = mysql.connector.connect(**self.DB_CONFIG)
-                df = pd.read_sql_query('SELECT * FROM orders ORDER BY created_at DESC', conn)
-                conn.close()
-                
-                df.to_csv(filename, index=False)
-                messagebox.showinfo("Success", f"✅ Data exported to {filename}")
+                # Rows are streamed into the file instead of loaded into a DataFrame first
+                with self.db.connection() as conn:
+                    if filename.lower().endswith('.xlsx'):
+                        count = exports.write_orders_xlsx(conn, filename)['Orders']
+                    else:
+                        count = exports.write_orders_csv(conn, filename, compress=filename.endswith('.gz'))
+                messagebox.showinfo("Success", f"✅ {count} orders exported to {filename}")
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error exporting data: {str(e)}")
@@ -0,0 +1,196 @@
+"""
+Virtual Order List for the Express Wash desktop application
+Shows an arbitrarily long list of rows through a ttk.Treeview that only ever
+holds the rows currently in the viewport. The rows themselves live in a plain
+Python list; scrolling re-renders the handful of visible items.
+"""
+
+from bisect import bisect_left
+
+
+class VirtualOrderList:
+    """Drives a Treeview and Scrollbar as a window onto a Python-side row store"""
+
+    def __init__(self, tree, scrollbar, format_row, key=lambda row: row[0]):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row    # row -> tuple of display values
+        self.key = key                  # row -> unique item id
+        self.rows = []
+        self.positions = {}             # item id -> index in rows
+        self.view = []                  # ascending indices into rows that pass the current filter
+        self.offset = 0                 # position in view of the first visible row
+        self.visible_count = int(tree.cget('height'))
+        self.selected_key = None
+        self.active = False
+        self._items = []
+
+        # Bound once and ignored while inactive (unbinding one handler in Tk
+        # can drop the application's own handlers for the same event)
+        tree.bind('<Configure>', self._on_configure, add='+')
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        tree.bind('<Button-4>', lambda e: self._scroll_units(-3), add='+')
+        tree.bind('<Button-5>', lambda e: self._scroll_units(3), add='+')
+        tree.bind('<Up>', lambda e: self._move_selection(-1), add='+')
+        tree.bind('<Down>', lambda e: self._move_selection(1), add='+')
+        tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_count), add='+')
+        tree.bind('<Next>', lambda e: self._move_selection(self.visible_count), add='+')
+
+    # Mode switching
+
+    def attach(self):
+        """Take over the tree's scrolling"""
+        if self.active:
+            return
+        self.active = True
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand='')
+
+    def detach(self):
+        """Give scrolling back to the tree and remove the rendered rows"""
+        if not self.active:
+            return
+        self.clear()
+        self.active = False
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+
+    # Data
+
+    def set_rows(self, rows):
+        """Replace the row store and show it from the top"""
+        self.rows = rows
+        self.positions = {str(self.key(row)): i for i, row in enumerate(rows)}
+        self.view = list(range(len(rows)))
+        self.offset = 0
+        self.render()
+
+    def set_view(self, indices):
+        """Show only the rows at these indices (ascending, i.e. in row order)"""
+        self.view = indices
+        self.offset = min(self.offset, self._max_offset())
+        self.render()
+
+    def clear(self):
+        self.rows = []
+        self.positions = {}
+        self.view = []
+        self.offset = 0
+        self.selected_key = None
+        self._delete_items()
+
+    def selected_row(self):
+        """Return the selected row, even if it is scrolled out of view"""
+        index = self.positions.get(self.selected_key)
+        return self.rows[index] if index is not None else None
+
+    # Rendering
+
+    def _delete_items(self):
+        if self._items:
+            self.tree.delete(*self._items)
+        self._items = []
+
+    def _max_offset(self):
+        return max(0, len(self.view) - self.visible_count)
+
+    def render(self):
+        """Materialize the rows in the viewport"""
+        self._delete_items()
+        visible = self.view[self.offset:self.offset + self.visible_count]
+        for index in visible:
+            row = self.rows[index]
+            iid = str(self.key(row))
+            self.tree.insert('', 'end', iid=iid, values=self.format_row(row))
+            self._items.append(iid)
+        if self.selected_key is not None and self.selected_key in self._items:
+            self.tree.selection_set(self.selected_key)
+
+        total = len(self.view)
+        if total:
+            first = self.offset / total
+            last = min(1.0, (self.offset + self.visible_count) / total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+
+    # Scrolling
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self.view)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_count
+            self._scroll_units(amount)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _scroll_units(self, amount):
+        if not self.active:
+            return None
+        self._scroll_to(self.offset + amount)
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        if not self.active:
+            return None
+        # Windows reports multiples of 120, macOS small deltas
+        step = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_units(step * 3)
+
+    def _on_configure(self, event):
+        # Fit as many rows as the widget can show
+        if self.active and self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                heading_height, row_height = bbox[1], bbox[3]
+                count = max(1, (event.height - heading_height) // max(1, row_height))
+                if count != self.visible_count:
+                    self.visible_count = count
+                    self.offset = min(self.offset, self._max_offset())
+                    self.render()
+
+    # Selection
+
+    def _on_select(self, event):
+        # Rows scrolled out of view are deleted, so only a non-empty
+        # selection says anything about what the user picked
+        if not self.active:
+            return
+        selection = self.tree.selection()
+        if selection:
+            self.selected_key = selection[0]
+
+    def _move_selection(self, step):
+        if not self.active:
+            return None
+        if not self.view:
+            return 'break'
+        position = None
+        index = self.positions.get(self.selected_key)
+        if index is not None:
+            i = bisect_left(self.view, index)
+            if i < len(self.view) and self.view[i] == index:
+                position = i
+        position = 0 if position is None else max(0, min(len(self.view) - 1, position + step))
+
+        # Scroll just far enough to keep the selection in the viewport
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible_count:
+            self.offset = position - self.visible_count + 1
+        self.selected_key = str(self.key(self.rows[self.view[position]]))
+        self.render()
+        self.tree.focus(self.selected_key)
+        self.tree.event_generate('<<TreeviewSelect>>')
+        return 'break'